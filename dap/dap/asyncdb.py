@@ -0,0 +1,26 @@
+"""
+Database Access From Async Views
+"""
+
+import functools
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func):
+    """Awaitable running func, which may use the ORM, on the shared thread pool.
+
+    Django 4.0 has no async ORM, and sync_to_async runs every sync view of
+    a process on one thread by default. Read-only work marked with this
+    runs on the pool instead, so concurrent requests query in parallel.
+    Connections are checked before and after each call, as a sync request
+    does at its start and end.
+    """
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(inner, thread_sensitive=False)
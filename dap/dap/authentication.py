@@ -0,0 +1,145 @@
+"""
+Cached Token Authentication
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from util.version.utils import get_version, bump, set_version, changed_since
+
+# sequence of revocations, and "<prefix><user id>" -> sequence of its latest.
+REVOKED_KEY = "token-auth:revoked"
+REVOKED_USER_PREFIX = "token-auth:revoked:"
+
+
+class TokenCache:
+    """Bounded LRU of token key -> user field values, each kept for ttl seconds.
+
+    revoke(user_id) bumps a sequence in the shared util.version table and
+    stamps the user's row with it. Every process compares the sequence with
+    its own at most once per check_interval seconds, and on a change drops
+    the entries of users stamped since, so a revoked token stops working
+    everywhere within check_interval while other users stay cached.
+    """
+
+    def __init__(self, size: int, ttl: float, check_interval: float):
+        self.size = size
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.keys_of = {}
+        self.version = None
+        self.checked_at = 0.0
+
+    def _sync(self) -> None:
+        if time.monotonic() - self.checked_at < self.check_interval:
+            return
+        version = get_version(REVOKED_KEY)
+        revoked = {}
+        if self.version is not None and version > self.version:
+            revoked = changed_since(REVOKED_USER_PREFIX, self.version)
+        with self.lock:
+            if self.version is not None and version < self.version:
+                # the table was reset, so whom to drop is unknown.
+                self.entries.clear()
+                self.keys_of.clear()
+            for key in revoked:
+                for token in list(self.keys_of.get(int(key[len(REVOKED_USER_PREFIX):]), ())):
+                    self._drop(token)
+            self.version = version
+            self.checked_at = time.monotonic()
+
+    def revoke(self, user_id: int) -> None:
+        """Drop user's entries in every process. Call it after the change commits."""
+        with transaction.atomic():
+            # the sequence row stays locked until commit, so stamps land in order.
+            set_version(f"{REVOKED_USER_PREFIX}{user_id}", bump(REVOKED_KEY))
+        self.forget_user(user_id)
+
+    def get(self, key: str) -> dict:
+        self._sync()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self.entries.move_to_end(key)
+            return fields
+
+    def put(self, key: str, fields: dict) -> None:
+        with self.lock:
+            self._drop(key)
+            self.entries[key] = (time.monotonic() + self.ttl, fields)
+            self.keys_of.setdefault(fields['id'], set()).add(key)
+            while len(self.entries) > self.size:
+                self._drop(next(iter(self.entries)))
+
+    def forget(self, key: str) -> None:
+        with self.lock:
+            self._drop(key)
+
+    def forget_user(self, user_id: int) -> None:
+        with self.lock:
+            for key in list(self.keys_of.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.keys_of.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            user_id = entry[1]['id']
+            keys = self.keys_of.get(user_id)
+            keys.discard(key)
+            if not keys:
+                del self.keys_of[user_id]
+
+
+token_cache = TokenCache(
+    settings.TOKEN_AUTH_CACHE_SIZE,
+    settings.TOKEN_AUTH_CACHE_TTL,
+    settings.TOKEN_AUTH_CACHE_CHECK_INTERVAL)
+
+
+def _loaded(model, fields: dict):
+    """Instance of model as if fetched from the database."""
+    instance = model(**fields)
+    instance._state.adding = False
+    instance._state.db = 'default'
+    return instance
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication remembering token -> user in process memory.
+
+    A cached token authenticates without a query. The user comes back with
+    every column, including mentor_id and mentee_id, so role checks stay
+    query-free too. On logout and on user update or delete (user.signals)
+    every process drops that user's entries within
+    TOKEN_AUTH_CACHE_CHECK_INTERVAL seconds, and any entry expires after
+    TOKEN_AUTH_CACHE_TTL seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        fields = token_cache.get(key)
+        if fields is not None:
+            user = _loaded(get_user_model(), fields)
+            return user, _loaded(Token, {'key': key, 'user_id': user.id})
+        user, token = super().authenticate_credentials(key)
+        token_cache.put(key, {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+        })
+        return user, token
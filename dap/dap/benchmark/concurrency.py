@@ -0,0 +1,138 @@
+"""
+Sync (WSGI) vs Async (ASGI) Concurrency Benchmark
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client, AsyncClient
+from django.utils import timezone
+from dap.benchmark.runner import _percentile
+
+WSGI = "wsgi"
+ASGI_SYNC = "asgi-sync"
+ASGI_ASYNC = "asgi-async"
+MODES = (WSGI, ASGI_SYNC, ASGI_ASYNC)
+SCENARIOS = ('lesson.list', 'lesson.retrieve', 'lesson.search')
+
+
+class QueryLatency:
+    """execute_wrapper sleeping before every query.
+
+    Stands in for the round trip to a database across the network, which
+    an in-process SQLite or local PostgreSQL hides. Threads sleeping here
+    release the GIL, as they do waiting on a socket.
+    """
+
+    def __init__(self, ms: float):
+        self.seconds = ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        connection_created.connect(self.install)
+        for connection in connections.all():
+            self.install(connection=connection)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self.install)
+        for connection in connections.all():
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+def requests(data: dict, scenario: str, total: int, seed: int = 0) -> list:
+    """total (path, params) of scenario on the sync routes."""
+    rng = random.Random(seed)
+    month = timezone.localdate().month
+    if scenario == 'lesson.list':
+        return [('/lesson/', {
+            'genres': rng.choice(data['genre_ids']),
+            'city': rng.choice(data['cities']),
+            'month': month,
+        }) for _ in range(total)]
+    if scenario == 'lesson.retrieve':
+        return [(f"/lesson/{rng.choice(data['lesson_ids'])}/", {}) for _ in range(total)]
+    return [('/lesson/search/', {'keyword': 'class'}) for _ in range(total)]
+
+
+def _wsgi(items: list, concurrency: int) -> tuple:
+    """Sync routes through the WSGI handler from concurrency threads."""
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+
+    def worker(offset: int):
+        client = Client(raise_request_exception=False)
+        local, codes = [], Counter()
+        try:
+            for path, params in items[offset::concurrency]:
+                started_at = time.perf_counter()
+                response = client.get(path, params)
+                local.append((time.perf_counter() - started_at) * 1000)
+                codes[response.status_code] += 1
+        finally:
+            connections.close_all()
+            with lock:
+                latencies.extend(local)
+                statuses.update(codes)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+async def _asgi(items: list, concurrency: int, prefix: str) -> tuple:
+    """Routes under prefix through the ASGI handler, concurrency requests in flight."""
+    client = AsyncClient(raise_request_exception=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], Counter()
+
+    async def call(path: str, params: dict):
+        async with semaphore:
+            started_at = time.perf_counter()
+            response = await client.get(prefix + path, params)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*(call(path, params) for path, params in items))
+    return latencies, statuses
+
+
+def measure(mode: str, items: list, concurrency: int) -> dict:
+    """Throughput and latency of items served in mode at concurrency.
+
+    wsgi runs the sync views on one thread per client, as a threaded WSGI
+    server does. asgi-sync runs the same views under the ASGI handler, which
+    serializes sync views onto one thread, and asgi-async runs the async
+    views of lesson.lesson.async_views.
+    """
+    started_at = time.perf_counter()
+    if mode == WSGI:
+        latencies, statuses = _wsgi(items, concurrency)
+    else:
+        prefix = "/async" if mode == ASGI_ASYNC else ""
+        latencies, statuses = asyncio.run(_asgi(items, concurrency, prefix))
+    elapsed = time.perf_counter() - started_at
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(ordered) / elapsed, 1),
+        'p50_ms': round(_percentile(ordered, 50), 3),
+        'p99_ms': round(_percentile(ordered, 99), 3),
+        'status': {str(code): count for code, count in sorted(statuses.items())},
+    }
@@ -0,0 +1,157 @@
+"""
+Benchmark Data Generator
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from lesson.lesson.models import Lesson
+from lesson.lesson.search import get_search_backend
+from lesson.summary.utils import rebuild as rebuild_summary
+from user.autocomplete import autocomplete
+from user.core.academy.models import Academy
+from user.core.genre.const import GENRE_LIST
+from user.core.genre.models import Genre
+from user.core.genre.utils import registry as genre_registry
+from user.profile.models import Mentor, Mentee
+from user.profile.search import rebuild as rebuild_mentor_index
+from util.location.address import gazetteer
+from util.location.geo import encode
+from util.location.utils import location_key
+from util.location.models import Location
+User = get_user_model()
+
+BATCH_SIZE = 1000
+PASSWORD = "benchmark"
+# Seoul city hall; lesson locations scatter around it.
+CENTER = (37.5665, 126.9780)
+
+
+def sizes(lessons: int) -> dict:
+    """Row counts of every model for a data set of lessons lessons."""
+    return {
+        'academies': max(1, lessons // 20),
+        'mentors': max(1, lessons // 10),
+        'mentees': max(1, lessons // 2),
+        'lessons': lessons,
+    }
+
+
+def _bulk(model, objects: list) -> list:
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def _through(relation, source: str, target: str, pairs) -> None:
+    through = relation.through
+    through.objects.bulk_create(
+        [through(**{source: a, target: b}) for a, b in pairs], batch_size=BATCH_SIZE)
+
+
+@transaction.atomic()
+def generate(academies: int, mentors: int, mentees: int, lessons: int, seed: int = 0) -> dict:
+    """Bulk create a reproducible data set and rebuild every derived table.
+
+    Rows are written with bulk_create, which bypasses signals, so the
+    summary, search, mentor and autocomplete indexes are rebuilt at the end.
+    Returns the created counts plus the ids the benchmark scenarios need.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    # names of every run are unique, the data set itself depends on seed only.
+    prefix = f"b{uuid.uuid4().hex[:6]}"
+
+    existing = set(Genre.objects.values_list('name', flat=True))
+    _bulk(Genre, [Genre(name=name) for name in GENRE_LIST if name not in existing])
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+
+    places = gazetteer().places
+    locations = []
+    for index in range(academies):
+        city, district = rng.choice(places)
+        detail = f"{city} {district} 벤치로 {index} {prefix}"
+        latitude = CENTER[0] + rng.uniform(-0.3, 0.3)
+        longitude = CENTER[1] + rng.uniform(-0.3, 0.3)
+        locations.append(Location(
+            type="academy", detail=detail, city=city, district=district,
+            latitude=latitude, longitude=longitude, geohash=encode(latitude, longitude),
+            key=location_key(detail, city, district)))
+    _bulk(Location, locations)
+    locations = list(Location.objects.filter(type="academy", key__in=[l.key for l in locations]).order_by('id'))
+
+    _bulk(Academy, [
+        Academy(name=f"{prefix}academy{index}"[:30], location=location)
+        for index, location in enumerate(locations)
+    ])
+    academy_rows = list(Academy.objects.filter(name__startswith=prefix).order_by('id'))
+
+    _bulk(Mentor, [Mentor(started_at=date(2015, 1, 1)) for _ in range(mentors)])
+    _bulk(Mentee, [Mentee(started_at=date(2020, 1, 1)) for _ in range(mentees)])
+    # bulk_create does not return pks on every database.
+    profiles = (
+        list(Mentor.objects.order_by('-id')[:mentors])[::-1],
+        list(Mentee.objects.order_by('-id')[:mentees])[::-1],
+    )
+    _through(Mentor.genre, 'mentor_id', 'genre_id', (
+        (mentor.id, genre) for mentor in profiles[0] for genre in rng.sample(genre_ids, 2)))
+    _through(Mentor.academy, 'mentor_id', 'academy_id', (
+        (mentor.id, rng.choice(academy_rows).id) for mentor in profiles[0]))
+    _through(Mentee.genre, 'mentee_id', 'genre_id', (
+        (mentee.id, rng.choice(genre_ids)) for mentee in profiles[1]))
+
+    users = [
+        User(email=f"{prefix}m{index}@bench.dap", username=f"mentor{index}"[:12], password=PASSWORD,
+             birth=date(1990, 1, 1), gender="male", mentor=mentor)
+        for index, mentor in enumerate(profiles[0])
+    ] + [
+        User(email=f"{prefix}e{index}@bench.dap", username=f"mentee{index}"[:12], password=PASSWORD,
+             birth=date(1995, 1, 1), gender="female", mentee=mentee)
+        for index, mentee in enumerate(profiles[1])
+    ]
+    _bulk(User, users)
+    users = list(User.objects.filter(email__startswith=prefix).order_by('id'))
+    mentor_users = [user for user in users if user.mentor_id]
+    mentee_users = [user for user in users if user.mentee_id]
+    tokens = [Token(user=user, key=Token.generate_key()) for user in mentee_users]
+    _bulk(Token, tokens)
+
+    lesson_rows = []
+    for index in range(lessons):
+        academy = rng.choice(academy_rows)
+        started_at = now + timedelta(days=rng.randrange(1, 90), hours=rng.randrange(24))
+        lesson_rows.append(Lesson(
+            title=f"{rng.choice(GENRE_LIST)} class {index}",
+            description="benchmark lesson",
+            started_at=started_at,
+            finished_at=started_at + timedelta(hours=1),
+            academy=academy,
+            location_id=academy.location_id,
+            price=rng.randrange(0, 100) * 1000,
+            recruit_number=rng.randrange(5, 50)))
+    _bulk(Lesson, lesson_rows)
+    lesson_ids = list(Lesson.objects.filter(academy__name__startswith=prefix).values_list('id', flat=True))
+    _through(Lesson.genre, 'lesson_id', 'genre_id', (
+        (lesson_id, genre) for lesson_id in lesson_ids for genre in rng.sample(genre_ids, 2)))
+    _through(Lesson.mentor, 'lesson_id', 'user_id', (
+        (lesson_id, rng.choice(mentor_users).id) for lesson_id in lesson_ids))
+
+    rebuild_summary()
+    get_search_backend().index(lesson_ids)
+    rebuild_mentor_index()
+    autocomplete.reset()
+    genre_registry.invalidate()
+    return {
+        'academies': len(academy_rows),
+        'mentors': len(mentor_users),
+        'mentees': len(mentee_users),
+        'lessons': len(lesson_ids),
+        'lesson_ids': lesson_ids,
+        'mentee_emails': [user.email for user in mentee_users],
+        'tokens': [token.key for token in tokens],
+        'genre_ids': genre_ids,
+        'cities': sorted({location.city for location in locations}),
+        'prefix': prefix,
+    }
@@ -0,0 +1,219 @@
+"""
+Seat Booking Load Generator
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from urllib import request as urlrequest
+from urllib.error import HTTPError, URLError
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from dap.benchmark.data import BATCH_SIZE, PASSWORD
+from dap.benchmark.runner import _percentile
+from lesson.booking.models import Booking
+from lesson.booking.const import ACCEPTED
+from lesson.booking.utils import drain
+from lesson.lesson.models import Lesson
+User = get_user_model()
+
+CLIENT_ERROR = "client"
+
+
+def seed_flash_sale(clients: int, seats: int) -> dict:
+    """One lesson with seats seats and clients users holding a token each."""
+    prefix = f"f{uuid.uuid4().hex[:6]}"
+    started_at = timezone.now() + timedelta(days=1)
+    lesson = Lesson.objects.create(
+        title=f"{prefix} flash sale",
+        started_at=started_at,
+        finished_at=started_at + timedelta(hours=1),
+        recruit_number=seats)
+    User.objects.bulk_create([
+        User(email=f"{prefix}c{index}@load.dap", username=f"client{index}"[:12], password=PASSWORD,
+             birth=date(1995, 1, 1), gender="female")
+        for index in range(clients)
+    ], batch_size=BATCH_SIZE)
+    users = list(User.objects.filter(email__startswith=prefix).order_by('id'))
+    tokens = [Token(user=user, key=Token.generate_key()) for user in users]
+    Token.objects.bulk_create(tokens, batch_size=BATCH_SIZE)
+    return {
+        'lesson_id': lesson.id,
+        'seats': seats,
+        'tokens': [token.key for token in tokens],
+        'prefix': prefix,
+    }
+
+
+def cleanup(sale: dict) -> None:
+    Lesson.objects.filter(pk=sale['lesson_id']).delete()
+    User.objects.filter(email__startswith=sale['prefix']).delete()
+
+
+class LockTimer:
+    """execute_wrapper timing the statements that lock the lesson row.
+
+    The conditional UPDATE of reserve_seat and release_seat and the
+    SELECT ... FOR UPDATE of drain_lesson wait on the row lock while
+    another transaction holds it, so their duration is the lock wait
+    plus a negligible execution time.
+    """
+
+    def __init__(self):
+        self.table = Lesson._meta.db_table
+        self.waits = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            head = sql.lstrip()[:7].upper()
+            if self.table in sql and (head == "UPDATE " or "FOR UPDATE" in sql):
+                self.waits.append((time.perf_counter() - started_at) * 1000)
+
+
+class TestClientTransport:
+    """Requests through the Django test client, in process."""
+    measures_locks = True
+
+    def __call__(self, method: str, path: str, token: str) -> tuple:
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = getattr(client, method.lower())(path)
+        return response.status_code, _detail(getattr(response, 'data', None))
+
+
+class HttpTransport:
+    """Requests to a running server, e.g. the local dev server."""
+    measures_locks = False
+
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def __call__(self, method: str, path: str, token: str) -> tuple:
+        req = urlrequest.Request(
+            self.url + path, method=method, headers={'Authorization': f"Token {token}"})
+        try:
+            with urlrequest.urlopen(req, timeout=self.timeout) as response:
+                return response.status, None
+        except HTTPError as e:
+            try:
+                data = json.loads(e.read() or b'null')
+            except ValueError:
+                data = None
+            return e.code, _detail(data)
+        except (URLError, OSError) as e:
+            return CLIENT_ERROR, type(e).__name__
+
+
+def _ok(code) -> bool:
+    return isinstance(code, int) and 200 <= code < 300
+
+
+def _detail(data):
+    if isinstance(data, dict):
+        return str(data.get('detail', ''))[:80] or None
+    if isinstance(data, str):
+        return data[:80]
+    return None
+
+
+def flash_sale(sale: dict, transport, concurrency: int, cancel_ratio: float = 0.0, seed: int = 0) -> dict:
+    """Let every client of sale book its lesson at once from concurrency threads.
+
+    Each thread takes every concurrency-th client, and all threads start
+    together behind a barrier. A booked client cancels again with
+    probability cancel_ratio.
+    """
+    path = f"/lesson/{sale['lesson_id']}/"
+    tokens = sale['tokens']
+    concurrency = max(1, min(concurrency, len(tokens)))
+    barrier = threading.Barrier(concurrency)
+    lock = threading.Lock()
+    latencies, statuses, errors, waits = [], Counter(), Counter(), []
+    outcome = Counter()
+
+    def worker(offset: int):
+        rng = random.Random(seed + offset)
+        timer = LockTimer()
+        local = ([], Counter(), Counter(), Counter())
+        try:
+            with connection.execute_wrapper(timer):
+                barrier.wait()
+                for token in tokens[offset::concurrency]:
+                    calls = [("GET", "participate")]
+                    for method, action in calls:
+                        started_at = time.perf_counter()
+                        code, detail = transport(method, f"{path}{action}/", token)
+                        local[0].append((time.perf_counter() - started_at) * 1000)
+                        local[1][f"{action} {code}"] += 1
+                        if detail and not _ok(code):
+                            local[2][f"{code} {detail}"] += 1
+                        if action == "participate" and code == 200:
+                            local[3]['booked'] += 1
+                            if rng.random() < cancel_ratio:
+                                calls.append(("PUT", "cancel"))
+                        elif action == "cancel" and code == 200:
+                            local[3]['cancelled'] += 1
+        finally:
+            connections.close_all()
+            with lock:
+                latencies.extend(local[0])
+                statuses.update(local[1])
+                errors.update(local[2])
+                outcome.update(local[3])
+                waits.extend(timer.waits)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(concurrency)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    drained = drain() if Booking.objects.filter(lesson_id=sale['lesson_id']).exists() else 0
+    if drained:
+        outcome['booked'] += Booking.objects.filter(lesson_id=sale['lesson_id'], status=ACCEPTED).count()
+
+    lesson = Lesson.objects.get(pk=sale['lesson_id'])
+    mentees = lesson.mentee.count()
+    ordered = sorted(latencies)
+    ordered_waits = sorted(waits)
+    return {
+        'clients': len(tokens),
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(_percentile(ordered, 50), 3),
+        'p99_ms': round(_percentile(ordered, 99), 3),
+        'lock_wait': {
+            'statements': len(ordered_waits),
+            'total_ms': round(sum(ordered_waits), 3),
+            'p50_ms': round(_percentile(ordered_waits, 50), 3),
+            'p99_ms': round(_percentile(ordered_waits, 99), 3),
+            'max_ms': round(ordered_waits[-1], 3),
+        } if transport.measures_locks and ordered_waits else None,
+        'status': dict(sorted(statuses.items())),
+        'errors': dict(errors.most_common()),
+        'drained': drained,
+        'seats': sale['seats'],
+        'recruit_number': lesson.recruit_number,
+        'mentees': mentees,
+        'booked': outcome['booked'],
+        'cancelled': outcome['cancelled'],
+        'consistent': (
+            lesson.recruit_number + mentees == sale['seats']
+            and mentees <= sale['seats']
+            and mentees == outcome['booked'] - outcome['cancelled']),
+    }
@@ -0,0 +1,128 @@
+"""
+Benchmark Runner
+"""
+
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from dap.authentication import token_cache
+from dap.benchmark.data import PASSWORD
+from user.autocomplete import autocomplete
+from user.core.genre.const import GENRE_LIST
+from user.core.genre.utils import registry as genre_registry
+
+
+def _percentile(ordered: list, percent: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _token(client: APIClient, key: str) -> APIClient:
+    client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+    return client
+
+
+def scenarios(data: dict) -> dict:
+    """name -> request(client, rng, index) of every benchmarked endpoint."""
+    lesson_ids, tokens = data['lesson_ids'], data['tokens']
+    return {
+        'lesson.list': lambda client, rng, index: client.get('/lesson/', {
+            'genres': rng.choice(data['genre_ids']),
+            'city': rng.choice(data['cities']),
+            'month': timezone.localdate().month,
+        }),
+        'lesson.retrieve': lambda client, rng, index: client.get(f"/lesson/{rng.choice(lesson_ids)}/"),
+        'lesson.search': lambda client, rng, index: client.get(
+            '/lesson/search/', {'keyword': rng.choice(GENRE_LIST)}),
+        'lesson.participate': lambda client, rng, index: _token(client, tokens[index % len(tokens)]).get(
+            f"/lesson/{rng.choice(lesson_ids)}/participate/"),
+        'user.mentor': lambda client, rng, index: client.get(
+            '/user/mentor/', {'name': f"mentor{rng.randrange(10)}"}),
+        'academy.list': lambda client, rng, index: client.get('/academy/', {'name': data['prefix']}),
+        'user.create': lambda client, rng, index: client.post('/user/', {
+            'email': f"{data['prefix']}new{index}@bench.dap",
+            'username': f"new{index}"[:12],
+            'password': PASSWORD,
+            'birth': '1995-01-01',
+            'gender': 'female',
+            'contact': f"{data['prefix']}{index}"[:20],
+            'mentee': {'started_at': '2020-01', 'genres': [rng.choice(data['genre_ids'])]},
+        }, format='json'),
+        'user.login': lambda client, rng, index: client.put('/user/login/', {
+            'email': data['mentee_emails'][index % len(data['mentee_emails'])],
+            'password': PASSWORD,
+        }, format='json'),
+    }
+
+
+def reset_process_caches() -> None:
+    """Forget every in-process and shared cache between data sets."""
+    cache.clear()
+    token_cache.clear()
+    autocomplete.reset()
+    genre_registry.invalidate()
+
+
+def measure(request, iterations: int, warmup: int, seed: int = 0) -> dict:
+    """Run request warmup + iterations times and summarize the measured runs."""
+    rng = random.Random(seed)
+    for index in range(warmup):
+        request(APIClient(), rng, -index - 1)
+    latencies, queries, statuses = [], [], Counter()
+    started_at = time.perf_counter()
+    for index in range(iterations):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as context:
+            call_started_at = time.perf_counter()
+            response = request(client, rng, index)
+            latencies.append((time.perf_counter() - call_started_at) * 1000)
+        queries.append(len(context))
+        statuses[response.status_code] += 1
+    elapsed = time.perf_counter() - started_at
+    ordered = sorted(latencies)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(_percentile(ordered, 50), 3),
+        'p99_ms': round(_percentile(ordered, 99), 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'throughput_rps': round(iterations / elapsed, 1),
+        'queries_avg': round(statistics.fmean(queries), 2),
+        'queries_max': max(queries),
+        'status': {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """Regressions of current against baseline as readable lines.
+
+    A scenario regresses when its p50 grows by more than tolerance,
+    or when it runs more queries on average.
+    """
+    regressions = []
+    for size, results in current['results'].items():
+        for name, result in results.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if result['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{size} {name}: p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+            if result['queries_avg'] > before['queries_avg']:
+                regressions.append(
+                    f"{size} {name}: queries {before['queries_avg']} -> {result['queries_avg']}")
+    return regressions
@@ -0,0 +1,330 @@
+"""
+Request Instrumentation
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of latency histogram buckets; the last bucket is unbounded.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+UNTAGGED = "untagged"
+
+_current = ContextVar('request_metrics', default=None)
+
+# Reads of util.version are freshness checks of process-wide caches, a fixed
+# cost of any request, so query budgets leave them out.
+VERSION_TABLE = "util_version"
+
+
+def budgeted(sql: str) -> bool:
+    """Whether sql counts toward a query budget."""
+    return VERSION_TABLE not in sql
+
+
+class RequestMetrics:
+    """Counters of one request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.tag = UNTAGGED
+        self.queries = 0
+        self.budgeted_queries = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+        # set by process_view, as the view and its serializers start.
+        self.view_started_at = None
+        self.view_sql_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            if budgeted(sql):
+                self.budgeted_queries += 1
+            self.sql_ms += (time.perf_counter() - started_at) * 1000
+
+
+class Histogram:
+    """Rolling window of the last METRICS_WINDOW requests of each tag."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, tag: str, total_ms: float, queries: int, sql_ms: float, serializer_ms: float,
+               app_ms: float) -> None:
+        with self.lock:
+            samples = self.samples.get(tag)
+            if samples is None:
+                samples = self.samples[tag] = deque(maxlen=self.window)
+            samples.append((total_ms, queries, sql_ms, serializer_ms, app_ms))
+
+    def reset(self) -> None:
+        with self.lock:
+            self.samples.clear()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            samples = {tag: list(values) for tag, values in self.samples.items()}
+        return {tag: _summary(tag, values) for tag, values in sorted(samples.items())}
+
+
+def _percentile(ordered: list, percent: float):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _summary(tag: str, values: list) -> dict:
+    total = sorted(value[0] for value in values)
+    queries = sorted(value[1] for value in values)
+    buckets = [0] * (len(BUCKETS_MS) + 1)
+    for value in total:
+        buckets[bisect_left(BUCKETS_MS, value)] += 1
+    return {
+        'count': len(values),
+        'latency_ms': {
+            'p50': round(_percentile(total, 50), 3),
+            'p90': round(_percentile(total, 90), 3),
+            'p99': round(_percentile(total, 99), 3),
+            'max': round(total[-1], 3),
+        },
+        'queries': {
+            'p50': _percentile(queries, 50),
+            'max': queries[-1],
+            'budget': settings.QUERY_BUDGETS.get(tag),
+        },
+        'sql_ms_avg': round(sum(value[2] for value in values) / len(values), 3),
+        'serializer_ms_avg': round(sum(value[3] for value in values) / len(values), 3),
+        'app_ms_avg': round(sum(value[4] for value in values) / len(values), 3),
+        'histogram': {
+            **{f"le_{bound}": count for bound, count in zip(BUCKETS_MS, buckets)},
+            'inf': buckets[-1],
+        },
+    }
+
+
+class Counters:
+    """Process-wide event counters, by group and name.
+
+    ex) counters.incr('lesson-list-cache', 'HIT')
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups = {}
+
+    def incr(self, group: str, name: str) -> None:
+        with self.lock:
+            counts = self.groups.setdefault(group, {})
+            counts[name] = counts.get(name, 0) + 1
+
+    def get(self, group: str) -> dict:
+        with self.lock:
+            return dict(self.groups.get(group, {}))
+
+    def reset(self) -> None:
+        with self.lock:
+            self.groups.clear()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {group: dict(counts) for group, counts in sorted(self.groups.items())}
+
+
+histogram = Histogram(settings.METRICS_WINDOW)
+counters = Counters()
+
+
+def view_tag(view_func, method: str) -> str:
+    """"<basename>.<action>" of a DRF viewset view, ex) "lesson.list".
+
+    Plain views may name themselves with a tag attribute.
+    """
+    if hasattr(view_func, 'tag'):
+        return view_func.tag
+    actions = getattr(view_func, 'actions', None)
+    initkwargs = getattr(view_func, 'initkwargs', {})
+    if not actions:
+        return getattr(view_func, '__name__', UNTAGGED)
+    basename = initkwargs.get('basename') or view_func.cls.__name__
+    return f"{basename}.{actions.get(method.lower(), method.lower())}"
+
+
+class TimedDataMixin:
+    """Add the outermost .data of a serializer to its request's serializer time.
+
+    Mixed into the list and retrieve serializers of this repo, in front of
+    the DRF class. .data of serializers nested in it is not counted twice.
+    """
+
+    @property
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializer_depth:
+            return super().data
+        metrics.serializer_depth += 1
+        started_at = time.perf_counter()
+        try:
+            return super().data
+        finally:
+            metrics.serializer_depth -= 1
+            metrics.serializer_ms += (time.perf_counter() - started_at) * 1000
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    """Meta.list_serializer_class of timed serializers."""
+
+
+# SQL lists of the open query_budget blocks, fed from every connection.
+_captures = []
+
+
+def _count_queries(execute, sql, params, many, context):
+    for captured in _captures:
+        captured.append(sql)
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def _install(sender=None, connection=None, **kwargs):
+    """Count queries of every connection into the current request's metrics.
+
+    Wrapping each connection once, rather than the request thread's
+    connection per request, also counts queries of async views, which
+    run in worker threads.
+    """
+    if _count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_queries)
+
+
+connection_created.connect(_install)
+
+
+class InstrumentationMiddleware:
+    """Measure SQL count, SQL time, serializer time, app time and latency of each request.
+
+    Serializer time is spent in .data of TimedDataMixin serializers. App time runs from the view's start until its response is rendered,
+    less SQL time: the view, its serializers and the renderer.
+
+    Results go to the Server-Timing header, the rolling histogram served by
+    metrics(), and a warning when a view exceeds its QUERY_BUDGETS entry.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Mark the instance as a coroutine function, as MiddlewareMixin does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        for conn in connections.all():
+            _install(connection=conn)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(metrics, response)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(metrics, response)
+
+    def finish(self, metrics: RequestMetrics, response):
+        finished_at = time.perf_counter()
+        total_ms = (finished_at - metrics.started_at) * 1000
+        app_ms = 0.0
+        if metrics.view_started_at is not None:
+            app_ms = (finished_at - metrics.view_started_at) * 1000 - (metrics.sql_ms - metrics.view_sql_ms)
+        response['Server-Timing'] = ", ".join((
+            f'sql;dur={metrics.sql_ms:.3f};desc="{metrics.queries} queries"',
+            f'ser;dur={metrics.serializer_ms:.3f}',
+            f'app;dur={app_ms:.3f}',
+            f'total;dur={total_ms:.3f}',
+        ))
+        histogram.record(metrics.tag, total_ms, metrics.queries, metrics.sql_ms, metrics.serializer_ms, app_ms)
+        budget = settings.QUERY_BUDGETS.get(metrics.tag)
+        if budget is not None and metrics.budgeted_queries > budget:
+            logger.warning(
+                "%s ran %d queries, over its budget of %d.", metrics.tag, metrics.budgeted_queries, budget)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.tag = view_tag(view_func, request.method)
+            metrics.view_started_at = time.perf_counter()
+            metrics.view_sql_ms = metrics.sql_ms
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics(request):
+    """Rolling latency and query histograms of this process, per view."""
+    return Response(histogram.snapshot())
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metric_counters(request):
+    """Event counters of this process, ex) lesson list cache hits and misses."""
+    return Response(counters.snapshot())
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(tag: str, budget: int = None):
+    """Fail when the block runs more budgeted queries than tag's budget.
+
+    Queries of every thread count, so async views, which query from the
+    thread pool, are measured too. Yields the list of SQL run so far.
+
+    ex) with query_budget('lesson.list'):
+            client.get('/lesson/', {'genres': 1, 'city': '서울특별시'})
+    """
+    budget = settings.QUERY_BUDGETS[tag] if budget is None else budget
+    for conn in connections.all():
+        _install(connection=conn)
+    captured = []
+    _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        _captures.remove(captured)
+    queries = [sql for sql in captured if budgeted(sql)]
+    if len(queries) > budget:
+        listing = "\n".join(queries)
+        raise QueryBudgetExceeded(f"{tag} ran {len(queries)} queries, budget is {budget}:\n{listing}")
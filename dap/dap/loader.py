@@ -0,0 +1,134 @@
+"""
+Request-Scoped Data Loader
+"""
+
+import asyncio
+from contextvars import ContextVar
+from django.db import models
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers
+
+_current = ContextVar('data_loader', default=None)
+
+
+class DataLoader:
+    """Identity map and batcher of related objects for one request.
+
+    Every instance passing through is kept once per (model, pk), and a
+    relation missing on one instance is loaded for every known instance of
+    the same model with a single prefetch query, so serializers resolving
+    relations object by object still cost one query per relation and level.
+    """
+
+    def __init__(self):
+        self.identity = {}
+        self.primed = {}
+
+    def canonical(self, obj):
+        """The instance of obj's row this loader hands out."""
+        if obj is None or obj.pk is None:
+            return obj
+        return self.identity.setdefault(obj._meta.concrete_model, {}).setdefault(obj.pk, obj)
+
+    def prime(self, objects) -> None:
+        """Register objects whose relations should be loaded together."""
+        for obj in objects:
+            if isinstance(obj, models.Model) and obj.pk is not None:
+                self.primed.setdefault(obj._meta.concrete_model, {})[id(obj)] = obj
+                self.canonical(obj)
+
+    def _batch(self, obj, loaded) -> list:
+        model = obj._meta.concrete_model
+        batch = {id(obj): obj}
+        for other in (*self.identity.get(model, {}).values(), *self.primed.get(model, {}).values()):
+            if not loaded(other):
+                batch[id(other)] = other
+        return list(batch.values())
+
+    def one(self, obj, name: str):
+        """Forward foreign key or one-to-one `name` of obj."""
+        if not isinstance(obj, models.Model):
+            return getattr(obj, name)
+        field = obj._meta.get_field(name)
+        if not field.is_cached(obj):
+            target = self.identity.get(field.related_model._meta.concrete_model, {}).get(
+                getattr(obj, field.attname))
+            if target is not None:
+                field.set_cached_value(obj, target)
+            elif getattr(obj, field.attname) is None:
+                return None
+            else:
+                batch = self._batch(obj, field.is_cached)
+                prefetch_related_objects(batch, name)
+                # known at once, so relations of the loaded rows batch too.
+                for other in batch:
+                    self._canonical_one(other, field)
+        return self._canonical_one(obj, field)
+
+    def _canonical_one(self, obj, field):
+        value = field.get_cached_value(obj)
+        canonical = self.canonical(value)
+        if canonical is not value:
+            field.set_cached_value(obj, canonical)
+        return canonical
+
+    def many(self, obj, name: str) -> list:
+        """Many-to-many or reverse foreign key `name` of obj."""
+        if not isinstance(obj, models.Model):
+            return list(getattr(obj, name).all())
+
+        def loaded(instance):
+            return name in getattr(instance, '_prefetched_objects_cache', {})
+
+        if not loaded(obj):
+            batch = self._batch(obj, loaded)
+            prefetch_related_objects(batch, name)
+            for other in batch:
+                self._canonical_many(other, name)
+        return self._canonical_many(obj, name)
+
+    def _canonical_many(self, obj, name: str) -> list:
+        queryset = obj._prefetched_objects_cache[name]
+        queryset._result_cache = [self.canonical(item) for item in queryset]
+        return queryset._result_cache
+
+
+def get_loader() -> DataLoader:
+    """Loader of the current request. outside a request, a loader of its own."""
+    return _current.get() or DataLoader()
+
+
+class DataLoaderMiddleware:
+    """Give every request its own DataLoader."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = _current.set(DataLoader())
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+
+    async def __acall__(self, request):
+        token = _current.set(DataLoader())
+        try:
+            return await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+
+class LoaderListSerializer(serializers.ListSerializer):
+    """ListSerializer handing the whole list to child.prime before serializing it."""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        self.child.prime(items)
+        return super().to_representation(items)
@@ -0,0 +1,121 @@
+"""
+Keyset Pagination
+"""
+
+import base64
+from datetime import datetime
+from django.db.models import Q
+from dap.errors import FieldError
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+STRING = "s:"
+RANK = "r:"
+
+
+def encode_cursor(direction: str, value, pk: int, rank: float = None) -> str:
+    """Encode position into an opaque cursor. value is a datetime or a str."""
+    value = STRING + value if isinstance(value, str) else value.isoformat()
+    if rank is not None:
+        value = f"{RANK}{rank!r}|{value}"
+    raw = f"{direction}|{value}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode cursor into (direction, value, pk, rank). rank is None if not ranked."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        direction, rest = raw.split("|", 1)
+        rank = None
+        if rest.startswith(RANK):
+            rank, rest = rest[len(RANK):].split("|", 1)
+            rank = float(rank)
+        value, pk = rest.rsplit("|", 1)
+        if direction not in (NEXT, PREVIOUS):
+            raise ValueError(direction)
+        if value.startswith(STRING):
+            return direction, value[len(STRING):], int(pk), rank
+        return direction, datetime.fromisoformat(value), int(pk), rank
+    except (ValueError, UnicodeError):
+        raise FieldError("invalid cursor.")
+
+
+class CursorPage:
+    """Page of CursorPaginator.
+
+    Attributes:
+        object_list (list): objects of this page.
+        next_cursor (str): cursor of the following page, None if last.
+        previous_cursor (str): cursor of the preceding page, None if first.
+    """
+    def __init__(self, object_list: list, next_cursor: str, previous_cursor: str):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class CursorPaginator:
+    """Keyset Paginator ordered by (-field, -id), or (field, id) if not descending.
+
+    Pages are fetched with a `(field, id) < (value, pk)` predicate instead of
+    OFFSET, and one extra row is read instead of running COUNT(*), so every
+    page costs the same single query. With rank, the name of a float
+    annotation, rows are ordered and keyed by (rank, field, id) instead,
+    rank going the same direction as field.
+    """
+    def __init__(self, queryset, per_page: int, field: str = "started_at", descending: bool = True,
+                 rank: str = None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+        self.rank = rank
+
+    def get_page(self, cursor: str = None) -> CursorPage:
+        field = self.field
+        queryset = self.queryset
+        direction = NEXT
+        if cursor:
+            direction, value, pk, rank = decode_cursor(cursor)
+            if (rank is None) != (self.rank is None):
+                raise FieldError("invalid cursor.")
+            lookup = "lt" if (direction == NEXT) == self.descending else "gt"
+            after = Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"id__{lookup}": pk})
+            if self.rank:
+                after = Q(**{f"{self.rank}__{lookup}": rank}) | (Q(**{self.rank: rank}) & after)
+            queryset = queryset.filter(after)
+
+        keys = ([self.rank] if self.rank else []) + [field, "id"]
+        if (direction == NEXT) == self.descending:
+            queryset = queryset.order_by(*(f"-{key}" for key in keys))
+        else:
+            queryset = queryset.order_by(*keys)
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if direction == PREVIOUS:
+            object_list.reverse()
+
+        if not object_list:
+            return CursorPage(object_list, None, None)
+        first, last = object_list[0], object_list[-1]
+        has_next = has_more if direction == NEXT else True
+        has_previous = bool(cursor) if direction == NEXT else has_more
+        return CursorPage(
+            object_list,
+            self._cursor(NEXT, last) if has_next else None,
+            self._cursor(PREVIOUS, first) if has_previous else None
+        )
+
+    def _cursor(self, direction: str, obj) -> str:
+        rank = getattr(obj, self.rank) if self.rank else None
+        return encode_cursor(direction, getattr(obj, self.field), obj.id, rank)
@@ -33,7 +33,7 @@ TIME_ZONE = 'Asia/Seoul'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'dap.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -45,6 +45,51 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Per process. Data read by several processes is versioned in util.version,
+# so no process reads an entry of a version another process invalidated.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dap',
+    }
+}
+
+# Lesson list responses are fresh for TIMEOUT seconds, then served stale until refreshed.
+LESSON_LIST_CACHE_TIMEOUT = 60
+LESSON_LIST_CACHE_STALE = 600
+
+# Authenticated tokens kept in process memory: at most SIZE tokens, each for TTL seconds.
+TOKEN_AUTH_CACHE_SIZE = 10000
+TOKEN_AUTH_CACHE_TTL = 60
+# Seconds a process trusts its cached tokens before checking for revocations.
+TOKEN_AUTH_CACHE_CHECK_INTERVAL = 1
+
+# Requests per view kept by the /metrics/ rolling histogram.
+METRICS_WINDOW = 1000
+
+# Most queries a request of "<basename>.<action>" may run, auth included, in a
+# warm process. Reads of util.version, the freshness checks of process-wide
+# caches, are not counted.
+# Enforced by dap.instrumentation.query_budget and warned about at runtime.
+QUERY_BUDGETS = {
+    'lesson.list': 4,
+    'lesson.retrieve': 8,
+    'lesson.search': 3,
+    'lesson.nearby': 2,
+    'lesson.calendar': 3,
+    'lesson-async.list': 4,
+    'lesson-async.retrieve': 8,
+    'lesson-async.search': 3,
+    'user.retrieve': 6,
+    'user.mentor': 2,
+    'academy.list': 2,
+    'genre.list': 1,
+    'autocomplete.list': 3,
+}
+
+# Queue participate requests and grant seats in batches with `manage.py drain_bookings`.
+LESSON_BOOKING_QUEUE = False
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -62,6 +107,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its timings cover every other middleware.
+    'dap.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,6 +116,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'dap.loader.DataLoaderMiddleware',
 ]
 
 ROOT_URLCONF = 'dap.urls'
@@ -1,7 +1,10 @@
 from django.urls import path, include
+from dap.instrumentation import metrics, metric_counters
 
 
 urlpatterns = [
     path('', include('user.urls')),
-    path('', include('lesson.urls'))
+    path('', include('lesson.urls')),
+    path('metrics/', metrics),
+    path('metrics/counters/', metric_counters),
 ]
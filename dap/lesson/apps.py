@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LessonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lesson'
+
+    def ready(self):
+        import lesson.lesson.signals
+        import lesson.summary.signals
@@ -0,0 +1,11 @@
+PENDING = "pending"
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+
+BOOKING_STATUS = (
+    (PENDING, "pending"),
+    (ACCEPTED, "accepted"),
+    (REJECTED, "rejected")
+)
+
+BATCH_SIZE = 500
@@ -0,0 +1,31 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from lesson.lesson.models import Lesson
+from lesson.booking.const import BOOKING_STATUS, PENDING
+User = get_user_model()
+
+
+class Booking(models.Model):
+    """Booking Queue Model.
+
+    Attributes:
+        id (int): booking's ticket number. FIFO order of the queue.
+        lesson (Lesson): lesson to participate.
+        user (User): user who requested.
+        status (str): pending, accepted or rejected.
+        reason (str): reason of rejection.
+        created_at (DateTime): requested time.
+        processed_at (DateTime): time when worker granted or rejected.
+    """
+    id = models.BigAutoField(primary_key=True)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="bookings")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bookings")
+    status = models.CharField(max_length=10, choices=BOOKING_STATUS, default=PENDING)
+    reason = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['lesson', 'status', 'id'], name='booking_lesson_status_idx'),
+        ]
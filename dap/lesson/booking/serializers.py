@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from lesson.booking.models import Booking
+
+
+class BookingSerializer(serializers.ModelSerializer):
+    ticket = serializers.IntegerField(source='id')
+
+    class Meta:
+        model = Booking
+        fields = (
+            'ticket',
+            'lesson',
+            'status',
+            'reason',
+            'created_at',
+            'processed_at'
+        )
+        extra_kwargs = {
+            'created_at': {'format': '%Y-%m-%dT%H:%M:%S'},
+            'processed_at': {'format': '%Y-%m-%dT%H:%M:%S'}
+        }
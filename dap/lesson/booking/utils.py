@@ -0,0 +1,81 @@
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import F
+from django.contrib.auth import get_user_model
+from dap.errors import NotFound
+from lesson.lesson.models import Lesson
+from lesson.lesson.signals import seats_changed
+from lesson.booking.models import Booking
+from lesson.booking.const import PENDING, ACCEPTED, REJECTED, BATCH_SIZE
+User = get_user_model()
+
+
+def enqueue(lesson_id: int, user: User) -> Booking:
+    """Put user at the end of lesson's booking queue.
+
+    Only inserts a ticket, so a rush of requests never contends
+    for the Lesson row. Seats are granted later by drain_lesson.
+    """
+    try:
+        lesson = Lesson.objects.only('id').get(pk=lesson_id)
+    except Lesson.DoesNotExist:
+        raise NotFound("Lesson does not exist.")
+    return Booking.objects.create(lesson=lesson, user=user)
+
+
+@transaction.atomic()
+def drain_lesson(lesson_id: int, batch_size: int = BATCH_SIZE) -> int:
+    """Grant seats to the oldest pending bookings of lesson, in FIFO order.
+
+    The whole batch costs a lock on the Lesson row, one bulk insert into the
+    mentee table, one UPDATE of recruit_number and one bulk update of tickets.
+    Returns the number of processed bookings.
+    """
+    try:
+        lesson = Lesson.objects.select_for_update().get(pk=lesson_id)
+    except Lesson.DoesNotExist:
+        return 0
+    bookings = list(
+        Booking.objects.filter(lesson_id=lesson_id, status=PENDING).order_by('id')[:batch_size])
+    if not bookings:
+        return 0
+
+    now = timezone.now()
+    joined = set(lesson.mentee.filter(
+        id__in=[booking.user_id for booking in bookings]
+    ).values_list('id', flat=True))
+    seats = lesson.recruit_number
+    granted = []
+    for booking in bookings:
+        booking.processed_at = now
+        if lesson.started_at <= now:
+            booking.status, booking.reason = REJECTED, "Lesson overdue."
+        elif booking.user_id in joined:
+            booking.status, booking.reason = REJECTED, "Already participated."
+        elif seats <= 0:
+            booking.status, booking.reason = REJECTED, "Lesson overcrowded."
+        else:
+            booking.status = ACCEPTED
+            joined.add(booking.user_id)
+            granted.append(booking.user_id)
+            seats -= 1
+
+    if granted:
+        Lesson.mentee.through.objects.bulk_create([
+            Lesson.mentee.through(lesson_id=lesson_id, user_id=user_id) for user_id in granted
+        ])
+        Lesson.objects.filter(pk=lesson_id).update(recruit_number=F('recruit_number') - len(granted))
+        seats_changed.send(sender=Lesson, lesson_id=lesson_id, joined=granted, left=[])
+    Booking.objects.bulk_update(bookings, ['status', 'reason', 'processed_at'])
+    return len(bookings)
+
+
+def drain(batch_size: int = BATCH_SIZE) -> int:
+    """Drain every lesson's queue until no booking is pending."""
+    processed = 0
+    while True:
+        lesson_ids = Booking.objects.filter(status=PENDING).values_list('lesson_id', flat=True).distinct()
+        drained = sum(drain_lesson(lesson_id, batch_size) for lesson_id in lesson_ids)
+        if not drained:
+            return processed
+        processed += drained
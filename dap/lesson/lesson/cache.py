@@ -0,0 +1,95 @@
+"""
+Lesson List Response Cache
+"""
+
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from dap.instrumentation import counters
+from util.version.utils import get_versions, bump
+
+LIST_PARAMS = (
+    'page',
+    'cursor',
+    'month',
+    'day',
+    'genres',
+    'city',
+    'recruit_number',
+    'max_price',
+    'min_price',
+    'academies',
+    'mentors',
+    'districts',
+)
+GLOBAL = '*'
+HIT = "HIT"
+MISS = "MISS"
+STALE = "STALE"
+# counters group of /metrics/counters/.
+COUNTERS = "lesson-list-cache"
+
+
+def _digest(value: str) -> str:
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def _version_key(city: str) -> str:
+    return f"lesson-list:{_digest(city)}"
+
+
+def normalize(query_params) -> str:
+    """Canonical form of the query params LessonViewSet.list reads."""
+    parts = []
+    for name in LIST_PARAMS:
+        values = sorted(set(query_params.getlist(name)))
+        if values:
+            parts.append(f"{name}={','.join(values)}")
+    return '&'.join(parts)
+
+
+def cache_stats() -> dict:
+    """Hit/miss/stale counters of this process."""
+    return {HIT: 0, MISS: 0, STALE: 0, **counters.get(COUNTERS)}
+
+
+def invalidate(city: str = GLOBAL) -> None:
+    """Invalidate cached lists of city, or of every city, in every process."""
+    bump(_version_key(city or ''))
+
+
+def get_or_set(query_params, compute, keys=()) -> tuple:
+    """Return (data, state) of the list response for query_params.
+
+    Keys embed the global and per-city versions, read with one query from
+    the shared util.version table, so invalidate() makes every affected
+    entry unreachable in every process at once. An entry older than
+    LESSON_LIST_CACHE_TIMEOUT is still served as STALE to everyone except the
+    one request that wins the refresh lock and recomputes it.
+
+    compute is called with the versions of keys, other util.version keys
+    read in the same query, to key what it derives per process.
+    """
+    city = query_params.get('city') or ''
+    versions = get_versions([_version_key(GLOBAL), _version_key(city), *keys])
+    key = "lesson-list:{}:{}:{}".format(
+        versions[_version_key(GLOBAL)],
+        versions[_version_key(city)],
+        _digest(normalize(query_params)))
+
+    entry = cache.get(key)
+    if entry is not None:
+        data, created_at = entry
+        if time.time() - created_at < settings.LESSON_LIST_CACHE_TIMEOUT:
+            counters.incr(COUNTERS, HIT)
+            return data, HIT
+        if not cache.add(f"{key}:lock", 1, settings.LESSON_LIST_CACHE_TIMEOUT):
+            counters.incr(COUNTERS, STALE)
+            return data, STALE
+
+    data = compute({key: versions[key] for key in keys})
+    cache.set(key, (data, time.time()), settings.LESSON_LIST_CACHE_STALE)
+    cache.delete(f"{key}:lock")
+    counters.incr(COUNTERS, MISS)
+    return data, MISS
@@ -0,0 +1,4 @@
+NEARBY_RADIUS_KM = 5
+NEARBY_MAX_RADIUS_KM = 50
+NEARBY_LIMIT = 20
+NEARBY_MAX_LIMIT = 100
@@ -0,0 +1,131 @@
+"""
+Lesson Bulk Export
+"""
+
+import csv
+import json
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch, prefetch_related_objects
+from user.core.genre.models import Genre
+from lesson.lesson.models import Lesson
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+NDJSON = "ndjson"
+CSV = "csv"
+EXPORT_FORMATS = (NDJSON, CSV)
+CONTENT_TYPES = {
+    NDJSON: "application/x-ndjson",
+    CSV: "text/csv",
+}
+CSV_HEADER = (
+    'id',
+    'title',
+    'description',
+    'started_at',
+    'finished_at',
+    'price',
+    'recruit_number',
+    'academy_id',
+    'academy',
+    'location',
+    'city',
+    'district',
+    'genres',
+    'mentor_ids',
+    'mentors',
+)
+
+
+class Echo:
+    """File-like object csv.writer writes a row into and hands back."""
+    def write(self, value):
+        return value
+
+
+def iter_lessons(chunk_size: int = CHUNK_SIZE):
+    """Yield every lesson with academy, location, genres and mentors loaded.
+
+    Rows come from a server-side cursor in chunks of chunk_size, and genres
+    and mentors are prefetched per chunk, so memory stays bounded by one
+    chunk whatever the table size.
+    """
+    queryset = Lesson.objects.select_related('academy', 'location').order_by('id')
+    chunk = []
+    for lesson in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(lesson)
+        if len(chunk) == chunk_size:
+            yield from _prefetched(chunk)
+            chunk = []
+    yield from _prefetched(chunk)
+
+
+def _prefetched(chunk: list) -> list:
+    prefetch_related_objects(
+        chunk,
+        Prefetch('genre', queryset=Genre.objects.only('id', 'name')),
+        Prefetch('mentor', queryset=User.objects.only('id', 'username'))
+    )
+    return chunk
+
+
+def lesson_row(lesson: Lesson) -> dict:
+    """Export document of a lesson."""
+    academy = lesson.academy
+    location = lesson.location
+    return {
+        'id': lesson.id,
+        'title': lesson.title,
+        'description': lesson.description,
+        'started_at': lesson.started_at.isoformat(),
+        'finished_at': lesson.finished_at.isoformat(),
+        'price': lesson.price,
+        'recruit_number': lesson.recruit_number,
+        'academy': {'id': academy.id, 'name': academy.name} if academy else None,
+        'location': {
+            'detail': location.detail,
+            'city': location.city,
+            'district': location.district
+        } if location else None,
+        'genres': [genre.name for genre in lesson.genre.all()],
+        'mentors': [{'id': mentor.id, 'username': mentor.username} for mentor in lesson.mentor.all()],
+    }
+
+
+def ndjson_lines(chunk_size: int = CHUNK_SIZE):
+    """Yield lessons as newline delimited JSON."""
+    for lesson in iter_lessons(chunk_size):
+        yield json.dumps(lesson_row(lesson), ensure_ascii=False) + "\n"
+
+
+def csv_lines(chunk_size: int = CHUNK_SIZE):
+    """Yield lessons as CSV lines, header first."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for lesson in iter_lessons(chunk_size):
+        row = lesson_row(lesson)
+        academy = row['academy'] or {}
+        location = row['location'] or {}
+        yield writer.writerow((
+            row['id'],
+            row['title'],
+            row['description'],
+            row['started_at'],
+            row['finished_at'],
+            row['price'],
+            row['recruit_number'],
+            academy.get('id'),
+            academy.get('name'),
+            location.get('detail'),
+            location.get('city'),
+            location.get('district'),
+            '|'.join(row['genres']),
+            '|'.join(str(mentor['id']) for mentor in row['mentors']),
+            '|'.join(mentor['username'] for mentor in row['mentors']),
+        ))
+
+
+def export_lines(export_format: str, chunk_size: int = CHUNK_SIZE):
+    if export_format == CSV:
+        return csv_lines(chunk_size)
+    return ndjson_lines(chunk_size)
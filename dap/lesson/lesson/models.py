@@ -1,10 +1,63 @@
+import math
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from user.core.academy.models import Academy
 from user.core.genre.models import Genre
 from django.contrib.auth import get_user_model
 from util.location.models import Location
+from util.location.utils import near_q
+from lesson.series.models import LessonSeries
 User = get_user_model()
 
+
+class LessonQuerySet(models.QuerySet):
+    """Lesson QuerySet."""
+
+    def for_list(self):
+        """Load everything LessonListSerializer reads in a fixed number of queries.
+
+        genres are not prefetched: LessonListSerializer reads their ids from the
+        through table and names from the genre registry.
+        """
+        return self.select_related('academy', 'location').prefetch_related(
+            models.Prefetch('mentor', queryset=User.objects.only('id', 'username'))
+        )
+
+    def for_retrieve(self):
+        """Load the whole tree LessonRetrieveSerializer nests in a bounded number of queries."""
+        academies = Academy.objects.select_related('location').prefetch_related('location__images')
+        mentors = User.objects.select_related('mentor', 'mentee').prefetch_related(
+            'mentor__genre',
+            'mentee__genre',
+            models.Prefetch('mentor__academy', queryset=academies)
+        )
+        return self.select_related('academy', 'location').prefetch_related(
+            'genre',
+            'location__images',
+            models.Prefetch('mentor', queryset=mentors)
+        )
+
+    def near(self, latitude: float, longitude: float, radius_km: float):
+        """Lessons held within radius_km, closest first by approximate distance.
+
+        annotated with distance_sq, the squared equirectangular distance in degrees,
+        which needs only arithmetic and so orders on any database.
+        """
+        cos = math.cos(math.radians(latitude))
+        dlat = models.F('location__latitude') - latitude
+        dlng = (models.F('location__longitude') - longitude) * cos
+        return self.filter(near_q(latitude, longitude, radius_km, prefix='location__')).annotate(
+            distance_sq=models.ExpressionWrapper(
+                dlat * dlat + dlng * dlng, output_field=models.FloatField())
+        ).order_by('distance_sq', 'id')
+
+    def for_search(self):
+        """Load everything LessonSearchSerializer reads in a fixed number of queries."""
+        return self.select_related('academy').prefetch_related(
+            models.Prefetch('mentor', queryset=User.objects.only('id', 'username'))
+        )
+
+
 class Lesson(models.Model):
     """Lesson Model.
 
@@ -19,6 +72,10 @@ class Lesson(models.Model):
         recruit_number (PositiveSmallInt): lesson's recruit number.
         genre (Genre): lesson's genres.
         location (Location): lesson's location.
+        mentee (User): lesson's participants.
+        series (LessonSeries): series lesson is materialized from.
+        search_vector (SearchVector): full-text document of title, description,
+            academy and mentors. maintained by lesson.lesson.search.
     """
     id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=100)
@@ -30,8 +87,18 @@ class Lesson(models.Model):
     mentor = models.ManyToManyField(User, related_name="lessons")
     recruit_number = models.PositiveSmallIntegerField(default=0)
     genre = models.ManyToManyField(Genre, related_name="lessons")
-    location = models.OneToOneField(Location, on_delete=models.CASCADE, null=True)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, null=True)
     mentee = models.ManyToManyField(User, related_name="classes")
+    series = models.ForeignKey(LessonSeries, on_delete=models.SET_NULL, null=True, related_name="occurrences")
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = LessonQuerySet.as_manager()
 
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['started_at', 'finished_at'], name='lesson_started_finished_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'started_at'], name='lesson_series_occurrence_unique'),
+        ]
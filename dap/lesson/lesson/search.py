@@ -0,0 +1,95 @@
+"""
+Lesson Search Backends
+"""
+
+import re
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Exists, F, FloatField, OuterRef, Q
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+from lesson.lesson.models import Lesson
+
+TSQUERY_SPECIAL = re.compile(r"[&|!():*<>'\\]")
+
+# title > description > academy name, mentor usernames.
+INDEX_SQL = """
+UPDATE "lesson_lesson" SET "search_vector" =
+    setweight(to_tsvector('simple', coalesce("lesson_lesson"."title", '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce("lesson_lesson"."description", '')), 'B') ||
+    setweight(to_tsvector('simple',
+        coalesce((
+            SELECT "user_academy"."name" FROM "user_academy"
+            WHERE "user_academy"."id" = "lesson_lesson"."academy_id"
+        ), '') || ' ' ||
+        coalesce((
+            SELECT string_agg("user_user"."username", ' ')
+            FROM "lesson_lesson_mentor"
+            INNER JOIN "user_user" ON "user_user"."id" = "lesson_lesson_mentor"."user_id"
+            WHERE "lesson_lesson_mentor"."lesson_id" = "lesson_lesson"."id"
+        ), '')
+    ), 'C')
+WHERE "lesson_lesson"."id" = ANY(%s)
+"""
+
+
+class SimpleSearchBackend:
+    """Substring search for databases without full-text search, e.g. SQLite.
+
+    Mentors are matched with an EXISTS subquery instead of a join,
+    so a lesson with several matching mentors is returned once.
+    """
+    def index(self, lesson_ids: list) -> None:
+        pass
+
+    def search(self, queryset, keyword: str):
+        mentors = Lesson.mentor.through.objects.filter(
+            lesson_id=OuterRef('pk'),
+            user__username__icontains=keyword)
+        return queryset.filter(
+            Q(title__icontains=keyword) |
+            Q(description__icontains=keyword) |
+            Q(academy__name__icontains=keyword) |
+            Exists(mentors)
+        ).order_by('-started_at')
+
+
+class PostgresSearchBackend:
+    """PostgreSQL full-text search over Lesson.search_vector.
+
+    The vector is denormalized on write and GIN-indexed, so matching is an
+    index lookup instead of ILIKE scans across joins. Every keyword term is a
+    prefix match and results are ordered by rank.
+    """
+    config = 'simple'
+
+    def index(self, lesson_ids: list) -> None:
+        lesson_ids = list(lesson_ids)
+        if not lesson_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(INDEX_SQL, [lesson_ids])
+
+    def search(self, queryset, keyword: str):
+        terms = TSQUERY_SPECIAL.sub(' ', keyword).split()
+        if not terms:
+            return queryset.none()
+        query = SearchQuery(
+            ' & '.join(f"{term}:*" for term in terms),
+            search_type='raw',
+            config=self.config)
+        # double precision, so a rank read back in a cursor compares equal to itself.
+        return queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        ).order_by('-rank', '-started_at')
+
+
+def get_search_backend():
+    """Return LESSON_SEARCH_BACKEND if set, else the best one for the database."""
+    path = getattr(settings, 'LESSON_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return SimpleSearchBackend()
@@ -4,6 +4,10 @@ from lesson.lesson.models import Lesson
 from util.location.serializers import LocationSerializer
 from dap.errors import FieldError
 from util.location.utils import set_location
+from util.location import geo
+from user.core.genre.utils import genre_names, attach_genre_ids
+from dap.loader import get_loader, LoaderListSerializer
+from dap.instrumentation import TimedDataMixin, TimedListSerializer
 
 class LessonCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,10 +29,8 @@ class LessonCreateSerializer(serializers.ModelSerializer):
 
     
     def create(self, validated_data: dict) -> Lesson:
-        lesson = Lesson.objects.create(**validated_data)
-        location = set_location(data=self.context, type="lesson", name=str(lesson.id))
-        lesson.location = location
-        lesson.save()
+        location = set_location(data=self.context, type="lesson", name=validated_data['title'])
+        lesson = Lesson.objects.create(**validated_data, location=location)
         lesson.genre.set(self.context['genres'])
         lesson.mentor.set(self.context['mentors'])
         return lesson
@@ -50,16 +52,29 @@ class LessonCreateSerializer(serializers.ModelSerializer):
 
         return data
 
-class LessonListSerializer(serializers.ModelSerializer):
+class LessonBulkCreateSerializer(LessonCreateSerializer):
+    """Validates one item of bulk creation.
+
+    academy is taken as a plain id, so validation needs no query;
+    bulk_create_lessons checks academies, genres and mentors in bulk.
+    """
+    academy = serializers.IntegerField(required=False, allow_null=True)
+
+class TimedLoaderListSerializer(TimedDataMixin, LoaderListSerializer):
+    """LoaderListSerializer counted in the request's serializer time."""
+
+class LessonListSerializer(TimedDataMixin, serializers.ModelSerializer):
     mentors = serializers.SerializerMethodField()
     genres = serializers.SerializerMethodField()
-    academy = serializers.CharField(source="academy.name")
-    location = serializers.CharField(source="location.detail")
+    academy = serializers.SerializerMethodField()
+    location = serializers.SerializerMethodField()
+    series = serializers.IntegerField(source="series_id")
 
     class Meta:
         model = Lesson
         fields = (
             'id',
+            'series',
             'title',
             'started_at',
             'finished_at',
@@ -74,14 +89,39 @@ class LessonListSerializer(serializers.ModelSerializer):
             'started_at': {'format': '%Y-%m-%dT%H:%M'},
             'finished_at': {'format': '%Y-%m-%dT%H:%M'}
         }
+        list_serializer_class = TimedLoaderListSerializer
+
+    def prime(self, lessons):
+        attach_genre_ids(lessons)
+        get_loader().prime(lessons)
+
+    def get_academy(self, lesson):
+        academy = get_loader().one(lesson, 'academy')
+        return academy.name if academy else None
+
+    def get_location(self, lesson):
+        location = get_loader().one(lesson, 'location')
+        return location.detail if location else None
 
     def get_genres(self, lesson):
-        return lesson.genre.all().values_list('name', flat=True)
+        return genre_names(lesson)
 
     def get_mentors(self, lesson):
-        return lesson.mentor.all().values_list('id', 'username')
+        return [(mentor.id, mentor.username) for mentor in get_loader().many(lesson, 'mentor')]
+
+class LessonNearbySerializer(LessonListSerializer):
+    distance = serializers.SerializerMethodField()
+
+    class Meta(LessonListSerializer.Meta):
+        fields = LessonListSerializer.Meta.fields + ('distance',)
+
+    def get_distance(self, lesson):
+        """Great-circle distance in km from the requested point."""
+        latitude, longitude = self.context['point']
+        return round(geo.distance(
+            latitude, longitude, lesson.location.latitude, lesson.location.longitude), 3)
 
-class LessonRetrieveSerializer(serializers.ModelSerializer):
+class LessonRetrieveSerializer(TimedDataMixin, serializers.ModelSerializer):
     mentors = serializers.SerializerMethodField()
     academy = serializers.SerializerMethodField()
     genres = serializers.SerializerMethodField()
@@ -107,7 +147,9 @@ class LessonRetrieveSerializer(serializers.ModelSerializer):
         }
 
     def get_academy(self, lesson):
-        academy = lesson.academy
+        academy = get_loader().one(lesson, 'academy')
+        if not academy:
+            return None
         #TODO: add academy logo
         return {
             'id': academy.id,
@@ -116,16 +158,16 @@ class LessonRetrieveSerializer(serializers.ModelSerializer):
         }
 
     def get_genres(self, lesson):
-        return lesson.genre.all().values_list('name', flat=True)
+        return genre_names(lesson)
 
     def get_location(self, lesson):
-        return LocationSerializer(lesson.location).data
+        return LocationSerializer(get_loader().one(lesson, 'location')).data
 
     def get_mentors(self, lesson):
-        return UserRetrieveSerializer(lesson.mentor.all(), many=True).data
+        return UserRetrieveSerializer(get_loader().many(lesson, 'mentor'), many=True).data
 
 
-class LessonSearchSerializer(serializers.ModelSerializer):
+class LessonSearchSerializer(TimedDataMixin, serializers.ModelSerializer):
     mentors = serializers.SerializerMethodField()
     academy = serializers.CharField(source="academy.name")
     class Meta:
@@ -138,8 +180,9 @@ class LessonSearchSerializer(serializers.ModelSerializer):
             'mentors',
             'academy',
         )
+        list_serializer_class = TimedListSerializer
     def get_mentors(self, lesson):
-        return lesson.mentor.all().values_list('id', 'username')
+        return [(mentor.id, mentor.username) for mentor in lesson.mentor.all()]
 
 
 class LessonUpdateSerializer(serializers.ModelSerializer):
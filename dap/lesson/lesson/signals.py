@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver, Signal
+from django.contrib.auth import get_user_model
+from lesson.lesson.models import Lesson
+from lesson.series.models import LessonSeries
+from lesson.series.utils import invalidate_series_cities
+from lesson.lesson.search import get_search_backend
+from lesson.lesson import cache as lesson_list_cache
+from user.core.academy.models import Academy
+from util.location.models import Location
+User = get_user_model()
+
+# Sent inside the transaction when mentees join or leave a lesson
+# through queryset updates, which bypass post_save and m2m_changed.
+# kwargs: lesson_id (int), joined (list of user ids), left (list of user ids).
+seats_changed = Signal()
+
+# Sent inside the transaction after lessons are bulk created,
+# which bypasses post_save and m2m_changed.
+# kwargs: lesson_ids (list of lesson ids).
+lessons_created = Signal()
+
+
+@receiver(post_save, sender=Lesson)
+def index_lesson(sender, instance, **kwargs):
+    """Reindex lesson on title, description or academy change."""
+    get_search_backend().index([instance.id])
+
+
+@receiver(m2m_changed, sender=Lesson.mentor.through)
+def index_lesson_mentors(sender, instance, action, reverse, pk_set, **kwargs):
+    """Reindex lessons whose mentors changed."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        lesson_ids = pk_set or []
+    else:
+        lesson_ids = [instance.id]
+    get_search_backend().index(lesson_ids)
+
+
+@receiver(post_save, sender=Academy)
+def index_academy_lessons(sender, instance, created, update_fields, **kwargs):
+    """Reindex lessons of renamed academy."""
+    if created or (update_fields and 'name' not in update_fields):
+        return
+    get_search_backend().index(instance.lesson_set.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def index_mentor_lessons(sender, instance, created, update_fields, **kwargs):
+    """Reindex lessons of renamed mentor."""
+    if created or (update_fields and 'username' not in update_fields):
+        return
+    get_search_backend().index(instance.lessons.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_save, sender=LessonSeries)
+@receiver(post_delete, sender=LessonSeries)
+@receiver(m2m_changed, sender=LessonSeries.genre.through)
+@receiver(m2m_changed, sender=LessonSeries.mentor.through)
+@receiver(post_save, sender=Academy)
+@receiver(m2m_changed, sender=Lesson.genre.through)
+@receiver(m2m_changed, sender=Lesson.mentor.through)
+def invalidate_lesson_lists(sender, **kwargs):
+    """Lesson, series, academy name, genres or mentors changed: invalidate every city."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(lesson_list_cache.invalidate)
+
+
+@receiver(post_save, sender=LessonSeries)
+@receiver(post_delete, sender=LessonSeries)
+def invalidate_lesson_series_cities(sender, **kwargs):
+    """Series created, moved or deleted: reload the cities holding series."""
+    transaction.on_commit(invalidate_series_cities)
+
+
+@receiver(post_save, sender=User)
+def invalidate_mentor_lesson_lists(sender, instance, created, update_fields, **kwargs):
+    """Mentor username changed: invalidate every city."""
+    if created or (update_fields and 'username' not in update_fields):
+        return
+    if instance.mentor_id:
+        transaction.on_commit(lesson_list_cache.invalidate)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_city_lesson_lists(sender, instance, **kwargs):
+    """Location changed: invalidate its city."""
+    transaction.on_commit(lambda: lesson_list_cache.invalidate(instance.city))
+
+
+@receiver(seats_changed)
+def invalidate_seat_lesson_lists(sender, lesson_id, **kwargs):
+    """recruit_number changed: invalidate the lesson's city."""
+    city = Lesson.objects.filter(pk=lesson_id).values_list('location__city', flat=True).first()
+    transaction.on_commit(lambda: lesson_list_cache.invalidate(city))
+
+
+@receiver(lessons_created)
+def index_created_lessons(sender, lesson_ids, **kwargs):
+    """Index bulk created lessons."""
+    get_search_backend().index(lesson_ids)
+
+
+@receiver(lessons_created)
+def invalidate_created_lesson_lists(sender, **kwargs):
+    """Lessons bulk created: invalidate every city."""
+    transaction.on_commit(lesson_list_cache.invalidate)
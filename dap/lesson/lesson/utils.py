@@ -0,0 +1,167 @@
+from datetime import timedelta
+from django.utils import timezone
+from django.db import transaction, IntegrityError
+from django.db.models import F
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import APIException
+from dap.errors import FieldError, NotFound, DuplicationError
+from lesson.lesson.models import Lesson
+from lesson.lesson.serializers import LessonBulkCreateSerializer
+from lesson.lesson.signals import seats_changed, lessons_created
+from user.core.academy.models import Academy
+from user.core.genre.utils import registry as genre_registry
+from util.location.models import LocationImage
+from util.location.serializers import LocationSerializer
+from util.location.utils import bulk_locations
+User = get_user_model()
+
+CANCEL_DEADLINE = timedelta(minutes=30)
+
+
+@transaction.atomic()
+def reserve_seat(lesson_id: int, user: User) -> None:
+    """Take one seat of lesson for user.
+
+    The seat is taken by a single conditional UPDATE, so concurrent requests
+    can never push recruit_number below 0, and the (lesson, user) unique
+    constraint of the through table rejects double participation.
+    """
+    now = timezone.now()
+    reserved = Lesson.objects.filter(
+        pk=lesson_id,
+        recruit_number__gt=0,
+        started_at__gt=now
+    ).update(recruit_number=F('recruit_number') - 1)
+    if not reserved:
+        try:
+            lesson = Lesson.objects.get(pk=lesson_id)
+        except Lesson.DoesNotExist:
+            raise NotFound("Lesson does not exist.")
+        if not (lesson.recruit_number > 0):
+            raise FieldError("Lesson overcrowded.")
+        raise FieldError("Lesson overdue.")
+    try:
+        with transaction.atomic():
+            Lesson.mentee.through.objects.create(lesson_id=lesson_id, user_id=user.id)
+    except IntegrityError:
+        raise DuplicationError("Already participated.")
+    seats_changed.send(sender=Lesson, lesson_id=lesson_id, joined=[user.id], left=[])
+
+
+@transaction.atomic()
+def release_seat(lesson_id: int, user: User) -> None:
+    """Give back user's seat of lesson."""
+    std = timezone.now() + CANCEL_DEADLINE
+    released, _ = Lesson.mentee.through.objects.filter(
+        lesson_id=lesson_id,
+        user_id=user.id,
+        lesson__started_at__gt=std
+    ).delete()
+    if not released:
+        try:
+            lesson = Lesson.objects.get(pk=lesson_id)
+        except Lesson.DoesNotExist:
+            raise NotFound("Lesson does not exist.")
+        if not lesson.mentee.filter(id=user.id).exists():
+            raise NotFound("Not participated.")
+        raise FieldError("Cancel overdue.")
+    Lesson.objects.filter(pk=lesson_id).update(recruit_number=F('recruit_number') + 1)
+    seats_changed.send(sender=Lesson, lesson_id=lesson_id, joined=[], left=[user.id])
+
+
+def _ids(values) -> set:
+    try:
+        return {int(value) for value in values or []}
+    except (TypeError, ValueError):
+        raise FieldError("ids should be integers.")
+
+
+@transaction.atomic()
+def bulk_create_lessons(items: list) -> tuple[list, list]:
+    """Validate and create many lessons at once.
+
+    Every item is validated first, references are checked with one query per
+    model, and the valid items are stored with one bulk_create each for
+    Location, LocationImage, Lesson and the genre and mentor through tables.
+    Addresses already stored are shared, and their images are not uploaded again.
+    Returns (created lessons, [{'index', 'detail'}] of rejected items).
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise FieldError("lesson should be an object.")
+            lesson_serializer = LessonBulkCreateSerializer(
+                data=item,
+                context={
+                    'location': item.get('location'),
+                    'genres': item.get('genres'),
+                    'mentors': item.get('mentors')
+                }
+            )
+            lesson_serializer.is_valid(raise_exception=True)
+            if not isinstance(item.get('location'), dict):
+                raise FieldError("location should be an object.")
+            location = dict(item['location'], type="lesson")
+            location_serializer = LocationSerializer(data=location)
+            location_serializer.is_valid(raise_exception=True)
+            valid.append({
+                'index': index,
+                'lesson': lesson_serializer.validated_data,
+                'location': location_serializer.validated_data,
+                'images': location.get('images') or [],
+                'genres': _ids(item['genres']),
+                'mentors': _ids(item['mentors'])
+            })
+        except APIException as e:
+            errors.append({'index': index, 'detail': e.detail})
+
+    academies = set(Academy.objects.filter(
+        id__in={item['lesson'].get('academy') for item in valid} - {None}
+    ).values_list('id', flat=True))
+    genres = genre_registry.known(set().union(*(item['genres'] for item in valid)))
+    mentors = set(User.objects.filter(
+        id__in=set().union(*(item['mentors'] for item in valid))
+    ).values_list('id', flat=True))
+    checked = []
+    for item in valid:
+        academy = item['lesson'].get('academy')
+        if academy and academy not in academies:
+            errors.append({'index': item['index'], 'detail': "academy does not exist."})
+        elif not item['genres'] <= genres:
+            errors.append({'index': item['index'], 'detail': "genres do not exist."})
+        elif not item['mentors'] <= mentors:
+            errors.append({'index': item['index'], 'detail': "mentors do not exist."})
+        else:
+            checked.append(item)
+    errors.sort(key=lambda error: error['index'])
+    if not checked:
+        return [], errors
+
+    locations = bulk_locations([item['location'] for item in checked])
+    lessons = Lesson.objects.bulk_create([
+        Lesson(
+            **{key: value for key, value in item['lesson'].items() if key != 'academy'},
+            academy_id=item['lesson'].get('academy'),
+            location=location
+        ) for item, (location, _) in zip(checked, locations)
+    ])
+    LocationImage.objects.bulk_create([
+        LocationImage(location=location, name=f"{location.type}/{lesson.id}", image=image)
+        for item, (location, created), lesson in zip(checked, locations, lessons)
+        if created
+        for image in item['images']
+    ])
+    Lesson.genre.through.objects.bulk_create([
+        Lesson.genre.through(lesson_id=lesson.id, genre_id=genre_id)
+        for item, lesson in zip(checked, lessons)
+        for genre_id in item['genres']
+    ])
+    Lesson.mentor.through.objects.bulk_create([
+        Lesson.mentor.through(lesson_id=lesson.id, user_id=mentor_id)
+        for item, lesson in zip(checked, lessons)
+        for mentor_id in item['mentors']
+    ])
+    lessons_created.send(sender=Lesson, lesson_ids=[lesson.id for lesson in lessons])
+    return lessons, errors
@@ -1,22 +1,42 @@
 from rest_framework import status, viewsets, permissions, generics
 from rest_framework.response import Response
-from dap.errors import NotAllowed, FieldError, NotFound, DuplicationError
+from dap.errors import NotAllowed, FieldError, NotFound, AnonymousError
 from lesson.lesson.models import Lesson
-from lesson.lesson.serializers import LessonCreateSerializer, LessonRetrieveSerializer, LessonListSerializer, LessonSearchSerializer, LessonUpdateSerializer
+from lesson.lesson.search import get_search_backend
+from lesson.lesson import cache as lesson_list_cache
+from lesson.lesson.serializers import LessonCreateSerializer, LessonRetrieveSerializer, LessonListSerializer, LessonSearchSerializer, LessonUpdateSerializer, LessonNearbySerializer
+from lesson.lesson.const import NEARBY_RADIUS_KM, NEARBY_MAX_RADIUS_KM, NEARBY_LIMIT, NEARBY_MAX_LIMIT
 from rest_framework.decorators import action
-from datetime import datetime, timedelta
+from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
-from django.db.models import Q
 from django.core.paginator import Paginator
+from dap.pagination import CursorPaginator, NEXT, PREVIOUS, decode_cursor, encode_cursor
 from util.location.utils import set_location
+from lesson.lesson.utils import reserve_seat, release_seat, bulk_create_lessons
+from lesson.booking.models import Booking
+from lesson.booking.serializers import BookingSerializer
+from lesson.booking.utils import enqueue
+from django.conf import settings
 from django.db import transaction
-import pytz 
-utc=pytz.UTC
+from django.http import StreamingHttpResponse
+from lesson.lesson.export import export_lines, EXPORT_FORMATS, CONTENT_TYPES, NDJSON
+from django.db.models import Sum, Q
+from django.utils import timezone
+from lesson.summary.models import LessonSummary
+from lesson.summary.utils import day_counts
+from lesson.series.models import LessonSeries
+from lesson.series.utils import expand, series_cities, SERIES_CITIES_KEY
+from user.core.genre.utils import with_genre_ids
 
 class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
     queryset = Lesson.objects.all()
     permission_classes = [permissions.AllowAny]
 
+    def get_queryset(self):
+        if self.action in ["retrieve", "participate"]:
+            return Lesson.objects.for_retrieve()
+        return super().get_queryset()
+
     def get_serializer_class(self):
         if self.action == "create":
             return LessonCreateSerializer
@@ -26,13 +46,15 @@ class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
             return LessonListSerializer
         elif self.action == "search":
             return LessonSearchSerializer
+        elif self.action == "nearby":
+            return LessonNearbySerializer
         elif self.action == "update":
             return LessonUpdateSerializer
     
     @transaction.atomic()
     def create(self, request):
         # TODO: custom permission such as MentorOnly
-        if not request.user.mentor:
+        if not request.user.mentor_id:
             raise NotAllowed("only mentor can create lesson.")
         data = request.data
         serializer = self.get_serializer(
@@ -47,6 +69,25 @@ class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
         lesson = serializer.save()
         return Response({"id": lesson.id, "status": "success"}, status=status.HTTP_201_CREATED)
 
+    @action(methods=["POST"], detail=False)
+    def bulk(self, request):
+        """Create many lessons at once, reporting rejected items by index."""
+        if not getattr(request.user, 'mentor_id', None):
+            raise NotAllowed("only mentor can create lesson.")
+        items = request.data.get('lessons')
+        if not isinstance(items, list) or not items:
+            raise FieldError("lessons required.")
+        lessons, errors = bulk_create_lessons(items)
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif lessons:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {"ids": [lesson.id for lesson in lessons], "errors": errors},
+            status=response_status)
+
     @transaction.atomic()
     def update(self, request, pk=None):
         try:
@@ -76,6 +117,17 @@ class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
         return super().delete(request, pk)
 
     def list(self, request):
+        data, state = lesson_list_cache.get_or_set(
+            request.query_params,
+            lambda versions: self.list_data(request, versions[SERIES_CITIES_KEY]),
+            keys=(SERIES_CITIES_KEY,))
+        return Response(data, status=status.HTTP_200_OK, headers={'X-Cache': state})
+
+    def list_data(self, request, version=None):
+        """Filtered, paginated and serialized lessons of list.
+
+        version is the SERIES_CITIES_KEY version, see series_cities.
+        """
         page = request.query_params.get('page', '1')
         today = datetime.today()
         month = int(request.query_params.get('month', today.month))
@@ -114,12 +166,8 @@ class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
                 minute=0, 
                 second=0)
         
-        results = Lesson.objects.filter(
-            started_at__gte=start, 
-            finished_at__lt=end,
-            genre__in=genres,
-            location__city=city)
-
+        # shared by Lesson and LessonSeries, whose field names match.
+        filters = Q(genre__in=genres, location__city=city)
         recruit_number = request.query_params.get('recruit_number')
         max_price = request.query_params.get('max_price')
         min_price = request.query_params.get('min_price')
@@ -127,77 +175,245 @@ class LessonViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
         mentors = request.query_params.getlist('mentors')
         districts = request.query_params.getlist('districts')
         if recruit_number:
-            results = results.filter(recruit_number__gte=recruit_number)
+            filters &= Q(recruit_number__gte=recruit_number)
         if min_price:
-            results = results.filter(price__gte=min_price)
+            filters &= Q(price__gte=min_price)
         if max_price:
-            results = results.filter(price__lte=max_price)
+            filters &= Q(price__lte=max_price)
         if academies:
-            results = results.filter(academy__in=academies)
+            filters &= Q(academy__in=academies)
         if mentors:
-            results = results.filter(mentor__in=mentors)
+            filters &= Q(mentor__in=mentors)
         if districts:
-            results = results.filter(location__district__in=districts)
+            filters &= Q(location__district__in=districts)
+
+        results = Lesson.objects.for_list().filter(
+            filters,
+            started_at__gte=start,
+            finished_at__lt=end)
 
+        occurrences = []
+        if city in series_cities(version):
+            occurrences = expand(
+                LessonSeries.objects.for_list().in_window(start, end).filter(filters).distinct(),
+                start,
+                end)
+        if 'cursor' in request.query_params:
+            if occurrences:
+                return self.merged_cursor_page_data(results, occurrences, request.query_params['cursor'])
+            return self.cursor_page_data(results, request.query_params['cursor'])
+        if occurrences:
+            return self.merged_page_data(results, occurrences, page)
         results = Paginator(results, 20).get_page(page)
-        return Response(self.get_serializer(results, many=True).data, status=status.HTTP_200_OK)
+        return self.get_serializer(results, many=True).data
+
+    def merged_page_data(self, results, occurrences, page):
+        """Page of lessons and series occurrences merged by started_at.
+
+        Only the first (page number * 20) lesson keys are read, since no
+        later lesson can land on the page.
+        """
+        results = results.prefetch_related(None).order_by('-started_at', '-id')
+        page = Paginator(range(results.distinct().count() + len(occurrences)), 20).get_page(page)
+        end = page.number * 20
+        keys = results.values_list('started_at', 'id').distinct()[:end]
+        items = sorted(
+            [(started_at, id, None) for started_at, id in keys] +
+            [(occurrence.started_at, 0, occurrence) for occurrence in occurrences],
+            key=lambda item: (item[0], item[1]),
+            reverse=True)[end - 20:end]
+        lessons = Lesson.objects.for_list().in_bulk([id for _, id, occurrence in items if not occurrence])
+        return self.get_serializer(
+            [occurrence or lessons[id] for _, id, occurrence in items],
+            many=True).data
+
+    def merged_cursor_page_data(self, results, occurrences, cursor):
+        """Cursor page of lessons and series occurrences merged by (started_at, id).
+
+        An occurrence has no id and is keyed by minus its series id, so it
+        follows the lessons starting at the same time. At most one page of
+        lessons past the cursor is read, since no later lesson can land on it.
+        """
+        def key(item):
+            return (item.started_at, item.id or -item.series_id)
+
+        direction = NEXT
+        page = CursorPaginator(results, 20).get_page(cursor)
+        if cursor:
+            direction, value, pk, _ = decode_cursor(cursor)
+            occurrences = [
+                occurrence for occurrence in occurrences
+                if (key(occurrence) < (value, pk)) == (direction == NEXT)]
+        items = sorted([*page, *occurrences], key=key, reverse=True)
+        if direction == NEXT:
+            has_next = page.next_cursor is not None or len(items) > 20
+            has_previous = bool(cursor)
+            items = items[:20]
+        else:
+            has_next = True
+            has_previous = page.previous_cursor is not None or len(items) > 20
+            items = items[-20:]
+        if not items:
+            return {'next': None, 'previous': None, 'results': []}
+        return {
+            'next': encode_cursor(NEXT, *key(items[-1])) if has_next else None,
+            'previous': encode_cursor(PREVIOUS, *key(items[0])) if has_previous else None,
+            'results': self.get_serializer(items, many=True).data
+        }
 
     @action(methods=["GET"], detail=True)
     def participate(self, request, pk=None):
         # TODO: 결제 기능 연동
-        user = request.user
-        now = datetime.now().replace(tzinfo=utc)
-        try:
-            lesson = Lesson.objects.get(pk=pk)
-            if not (lesson.recruit_number > 0):
-                raise FieldError("Lesson overcrowded.")
-            if user.classes.filter(id=pk).exists():
-                raise DuplicationError("Already participated.")
-            if lesson.started_at <= now:
-                raise FieldError("Lesson overdue.")
-        except Lesson.DoesNotExist:
-            raise NotFound("Lesson does not exist.")
-        lesson.recruit_number-=1
-        lesson.mentee.add(user)
-        lesson.save()
+        if not request.user.is_authenticated:
+            raise AnonymousError()
+        if settings.LESSON_BOOKING_QUEUE:
+            booking = enqueue(pk, request.user)
+            return Response(BookingSerializer(booking).data, status=status.HTTP_202_ACCEPTED)
+        reserve_seat(pk, request.user)
+        lesson = self.get_queryset().get(pk=pk)
         return Response(self.get_serializer(lesson).data, status=status.HTTP_200_OK)
 
+    @action(methods=["GET"], detail=True)
+    def booking(self, request, pk=None):
+        """Poll latest booking ticket of user for lesson."""
+        if not request.user.is_authenticated:
+            raise AnonymousError()
+        booking = Booking.objects.filter(lesson_id=pk, user=request.user).order_by('-id').first()
+        if not booking:
+            raise NotFound("Booking does not exist.")
+        return Response(BookingSerializer(booking).data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False)
+    def calendar(self, request):
+        """Lessons and open seats per day of a month.
+
+        Read from LessonSummary, or from Lesson when several genres are asked.
+        """
+        today = timezone.localdate()
+        try:
+            year = int(request.query_params.get('year', today.year))
+            month = int(request.query_params.get('month', today.month))
+            first = date(year, month, 1)
+            end = first + relativedelta(months=1)
+        except (ValueError, TypeError, OverflowError):
+            raise FieldError("year and month should be a valid month.")
+        city = request.query_params.get('city')
+        genres = request.query_params.getlist('genres')
+        districts = request.query_params.getlist('districts')
+        if not city:
+            raise FieldError("city is empty.")
+
+        if len(set(genres)) > 1:
+            # a lesson with several of the genres sits in several cells, so count lessons.
+            start = timezone.make_aware(datetime.combine(first, datetime.min.time()))
+            lessons = Lesson.objects.filter(
+                genre__in=genres,
+                location__city=city,
+                started_at__gte=start,
+                started_at__lt=timezone.make_aware(datetime.combine(end, datetime.min.time())))
+            if districts:
+                lessons = lessons.filter(location__district__in=districts)
+            days = day_counts(lessons)
+        else:
+            results = LessonSummary.objects.filter(
+                city=city,
+                day__gte=first,
+                day__lt=end,
+                genre=genres[0] if genres else None)
+            if districts:
+                results = results.filter(district__in=districts)
+            days = {
+                row['day']: row for row in results.values('day').annotate(
+                    lessons=Sum('lesson_count'),
+                    seats=Sum('seat_count'))
+            }
+
+        # series occurrences are not materialized, so count them on the fly.
+        series = LessonSeries.objects.filter(location__city=city)
+        if genres:
+            series = series.filter(genre__in=genres)
+        if districts:
+            series = series.filter(location__district__in=districts)
+        start = datetime.combine(first, datetime.min.time())
+        for occurrence in expand(series.distinct(), start, start+relativedelta(months=1)):
+            day = timezone.localtime(occurrence.started_at).date()
+            row = days.setdefault(day, {'day': day, 'lessons': 0, 'seats': 0})
+            row['lessons'] += 1
+            row['seats'] += occurrence.recruit_number
+        return Response(sorted(days.values(), key=lambda row: row['day']), status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False, permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
+        """Stream every lesson as NDJSON or CSV."""
+        export_format = request.query_params.get('type', NDJSON)
+        if export_format not in EXPORT_FORMATS:
+            raise FieldError("type should be ndjson or csv.")
+        response = StreamingHttpResponse(
+            export_lines(export_format),
+            content_type=CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = f'attachment; filename="lessons.{export_format}"'
+        return response
+
     @action(methods=["GET"], detail=False)
     def search(self, request):
-        # TODO: results 중복 제거
         page = request.query_params.get('page', '1')
         keyword = request.query_params.get('keyword', None)
         past = request.query_params.get('past', False)
         now = datetime.now()
-        results = []
+        results = Lesson.objects.none()
         if keyword:
-            results = Lesson.objects.filter(
-                Q(title__icontains=keyword) |\
-                Q(description__icontains=keyword) |\
-                Q(academy__name__icontains=keyword) |\
-                Q(mentor__username__icontains=keyword)
-            )
+            results = Lesson.objects.for_search()
             if not past:
                 results = results.filter(finished_at__gt=now)
-            results = results.order_by("-started_at")
+            results = get_search_backend().search(results, keyword)
+        if 'cursor' in request.query_params:
+            return Response(
+                self.cursor_page_data(
+                    results, request.query_params['cursor'],
+                    rank='rank' if 'rank' in results.query.annotations else None),
+                status=status.HTTP_200_OK)
         results = Paginator(results, 20).get_page(page)
         return Response(self.get_serializer(results, many=True).data, status=status.HTTP_200_OK)
 
+    @action(methods=["GET"], detail=False)
+    def nearby(self, request):
+        """Upcoming lessons within radius km of (lat, lng), closest first."""
+        try:
+            latitude = float(request.query_params['lat'])
+            longitude = float(request.query_params['lng'])
+            radius = float(request.query_params.get('radius', NEARBY_RADIUS_KM))
+            limit = int(request.query_params.get('limit', NEARBY_LIMIT))
+        except KeyError:
+            raise FieldError("lat and lng required.")
+        except ValueError:
+            raise FieldError("lat, lng, radius and limit should be numbers.")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise FieldError("invalid lat, lng.")
+        if not 0 < radius <= NEARBY_MAX_RADIUS_KM:
+            raise FieldError(f"radius should be between 0 and {NEARBY_MAX_RADIUS_KM}.")
+        if not 0 < limit <= NEARBY_MAX_LIMIT:
+            raise FieldError(f"limit should be between 1 and {NEARBY_MAX_LIMIT}.")
+        results = with_genre_ids(Lesson.objects.for_list().filter(
+            started_at__gt=timezone.now()
+        ).near(latitude, longitude, radius))[:limit]
+        serializer = self.get_serializer(
+            results, many=True,
+            context={**self.get_serializer_context(), 'point': (latitude, longitude)})
+        data = [lesson for lesson in serializer.data if lesson['distance'] <= radius]
+        return Response(data, status=status.HTTP_200_OK)
+
+    def cursor_page_data(self, results, cursor, rank=None):
+        """Keyset-paginated page on ([rank,] started_at, id), without COUNT query."""
+        page = CursorPaginator(results, 20, rank=rank).get_page(cursor)
+        return {
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+            'results': self.get_serializer(page, many=True).data
+        }
+
     @action(methods=["PUT"], detail=True)
     def cancel(self, request, pk=None):
-        std = (datetime.now() + timedelta(minutes=30)).replace(tzinfo=utc)
-        user = request.user
-        try:
-            lesson = Lesson.objects.get(pk=pk)
-            if lesson.recruit_number <= 0:
-                raise FieldError("recruit number is already 0.")
-            if not user.classes.filter(id=pk).exists():
-                raise NotFound("Not participated.")
-            if lesson.started_at <= std:
-                raise FieldError("Cancel overdue.")
-        except Lesson.DoesNotExist:
-            raise NotFound("Lesson does not exist.")
-        lesson.mentee.remove(user)
-        lesson.recruit_number+=1
-        lesson.save()
+        if not request.user.is_authenticated:
+            raise AnonymousError()
+        release_seat(pk, request.user)
         return Response("Successfully Canceled.", status=status.HTTP_200_OK)
@@ -0,0 +1,85 @@
+import json
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from dap.benchmark.data import generate, sizes
+from dap.benchmark.runner import scenarios, measure, reset_process_caches, git_revision, compare
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the core API endpoints through the test client on a throwaway test "
+        "database of the configured backend, at several data sizes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000],
+                            help="lesson counts of the generated data sets.")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scenarios', nargs='+', help="subset of scenario names.")
+        parser.add_argument('--output', help="write results as a JSON baseline.")
+        parser.add_argument('--compare', help="JSON baseline to compare results against.")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="allowed p50 growth over the baseline, as a ratio.")
+        parser.add_argument('--strict', action='store_true', help="fail on regressions.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"wrote {options['output']}.")
+        if baseline:
+            regressions = compare(baseline, report, options['tolerance'])
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(f"regression {line}"))
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("no regression."))
+            elif options['strict']:
+                raise CommandError(f"{len(regressions)} regressions.")
+
+    def run(self, options) -> dict:
+        report = {
+            'meta': {
+                'vendor': connection.vendor,
+                'revision': git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+            },
+            'results': {},
+        }
+        for size in options['sizes']:
+            call_command('flush', interactive=False, verbosity=0)
+            reset_process_caches()
+            counts = sizes(size)
+            data = generate(**counts, seed=options['seed'])
+            self.stdout.write(f"== {connection.vendor}, " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+            results = report['results'][str(size)] = {}
+            for name, request in scenarios(data).items():
+                if options['scenarios'] and name not in options['scenarios']:
+                    continue
+                result = results[name] = measure(
+                    request, options['iterations'], options['warmup'], options['seed'])
+                self.stdout.write(
+                    f"{name:<20} p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                    f"{result['throughput_rps']:>7.1f} req/s  queries {result['queries_avg']:>5} "
+                    f"(max {result['queries_max']})  {result['status']}")
+        return report
@@ -0,0 +1,66 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from dap.benchmark.concurrency import MODES, SCENARIOS, QueryLatency, requests, measure
+from dap.benchmark.data import generate, sizes
+from dap.benchmark.runner import reset_process_caches, git_revision
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the sync lesson views under WSGI and ASGI with the async views "
+        "under ASGI at high concurrency, on a throwaway test database of the configured backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1000, help="lesson count of the generated data set.")
+        parser.add_argument('--requests', type=int, default=500, help="requests per scenario and mode.")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 100])
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help="simulated database round trip added to every query, in ms.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="write results as JSON.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            reset_process_caches()
+            data = generate(**sizes(options['size']), seed=options['seed'])
+            # the data set stays, and pooled threads open their own connections.
+            connection.close()
+            report = {
+                'meta': {
+                    'vendor': connection.vendor,
+                    'revision': git_revision(),
+                    'created_at': timezone.now().isoformat(),
+                    'size': options['size'],
+                    'requests': options['requests'],
+                    'latency_ms': options['latency'],
+                },
+                'results': {},
+            }
+            for scenario in options['scenarios']:
+                items = requests(data, scenario, options['requests'], options['seed'])
+                for concurrency in options['concurrency']:
+                    for mode in options['modes']:
+                        with QueryLatency(options['latency']):
+                            result = measure(mode, items, concurrency)
+                        report['results'].setdefault(scenario, {}).setdefault(str(concurrency), {})[mode] = result
+                        self.stdout.write(
+                            f"{scenario:<16} c={concurrency:<4} {mode:<10} "
+                            f"{result['throughput_rps']:>8.1f} req/s  p50 {result['p50_ms']:>8.2f}ms  "
+                            f"p99 {result['p99_ms']:>8.2f}ms  {result['status']}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"wrote {options['output']}.")
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from lesson.booking.utils import drain
+from lesson.booking.const import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Grant seats to queued lesson bookings in FIFO batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="keep draining until interrupted.")
+        parser.add_argument('--interval', type=float, default=0.5, help="seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = drain(options['batch_size'])
+            if processed:
+                self.stdout.write(f"processed {processed} bookings.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from lesson.lesson.export import export_lines, EXPORT_FORMATS, NDJSON, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Stream every lesson with academy, location, genres and mentors as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default=NDJSON)
+        parser.add_argument('--output', help="file path. stdout if omitted.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines = export_lines(options['format'], options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            output.writelines(lines)
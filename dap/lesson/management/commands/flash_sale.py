@@ -0,0 +1,74 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment, override_settings
+from dap.benchmark.load import seed_flash_sale, cleanup, flash_sale, TestClientTransport, HttpTransport
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a flash sale: many clients book one lesson at once. Runs through the test "
+        "client on a throwaway test database, or against a running server with --url."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--seats', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=50, help="number of client threads.")
+        parser.add_argument('--cancel-ratio', type=float, default=0.0,
+                            help="share of booked clients that cancel right after.")
+        parser.add_argument('--queue', action='store_true',
+                            help="book through the booking queue. test client only, "
+                                 "a running server follows its own LESSON_BOOKING_QUEUE.")
+        parser.add_argument('--url', help="base url of a running server sharing the configured database.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="write the report as JSON.")
+
+    def handle(self, *args, **options):
+        if options['url']:
+            report = self.run(HttpTransport(options['url']), options)
+        else:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                with override_settings(LESSON_BOOKING_QUEUE=options['queue']):
+                    report = self.run(TestClientTransport(), options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        lock_wait = report['lock_wait']
+        self.stdout.write(
+            f"{report['requests']} requests from {report['concurrency']} threads in {report['elapsed_s']}s, "
+            f"{report['throughput_rps']} req/s, p50 {report['p50_ms']}ms, p99 {report['p99_ms']}ms")
+        if lock_wait:
+            self.stdout.write(
+                f"lock wait: {lock_wait['statements']} statements, total {lock_wait['total_ms']}ms, "
+                f"p50 {lock_wait['p50_ms']}ms, p99 {lock_wait['p99_ms']}ms, max {lock_wait['max_ms']}ms")
+        self.stdout.write(f"status: {report['status']}")
+        for error, count in report['errors'].items():
+            self.stdout.write(f"  {count:>6} {error}")
+        if report['drained']:
+            self.stdout.write(f"drained {report['drained']} bookings.")
+        summary = (
+            f"seats {report['seats']}, recruit_number {report['recruit_number']}, mentees {report['mentees']}, "
+            f"booked {report['booked']}, cancelled {report['cancelled']}")
+        if report['consistent']:
+            self.stdout.write(self.style.SUCCESS(f"consistent: {summary}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"inconsistent: {summary}"))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"wrote {options['output']}.")
+
+    def run(self, transport, options) -> dict:
+        sale = seed_flash_sale(options['clients'], options['seats'])
+        try:
+            return flash_sale(
+                sale, transport, options['concurrency'], options['cancel_ratio'], options['seed'])
+        finally:
+            if options['url']:
+                cleanup(sale)
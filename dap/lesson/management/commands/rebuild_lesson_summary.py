@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from lesson.summary.utils import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the lesson calendar summary table from scratch."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild()
+        self.stdout.write(f"rebuilt {count} summary rows.")
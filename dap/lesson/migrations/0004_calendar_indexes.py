@@ -0,0 +1,26 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lesson', '0003_lesson_mentee'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='lesson',
+            options={'ordering': ['-started_at']},
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['started_at', 'finished_at'], name='lesson_started_finished_idx'),
+        ),
+        # genre__in filter probes the auto-created through table by genre_id first.
+        migrations.RunSQL(
+            sql='CREATE INDEX "lesson_genre_genre_lesson_idx" ON "lesson_lesson_genre" ("genre_id", "lesson_id");',
+            reverse_sql='DROP INDEX "lesson_genre_genre_lesson_idx";',
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:39
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+BACKFILL_SQL = """
+UPDATE "lesson_lesson" SET "search_vector" =
+    setweight(to_tsvector('simple', coalesce("lesson_lesson"."title", '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce("lesson_lesson"."description", '')), 'B') ||
+    setweight(to_tsvector('simple',
+        coalesce((
+            SELECT "user_academy"."name" FROM "user_academy"
+            WHERE "user_academy"."id" = "lesson_lesson"."academy_id"
+        ), '') || ' ' ||
+        coalesce((
+            SELECT string_agg("user_user"."username", ' ')
+            FROM "lesson_lesson_mentor"
+            INNER JOIN "user_user" ON "user_user"."id" = "lesson_lesson_mentor"."user_id"
+            WHERE "lesson_lesson_mentor"."lesson_id" = "lesson_lesson"."id"
+        ), '')
+    ), 'C')
+"""
+
+
+def create_search_index(apps, schema_editor):
+    # GIN is PostgreSQL only; other databases fall back to SimpleSearchBackend.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(BACKFILL_SQL)
+    schema_editor.execute(
+        'CREATE INDEX "lesson_search_vector_idx" ON "lesson_lesson" USING gin ("search_vector");')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX "lesson_search_vector_idx";')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lesson', '0004_calendar_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0011_remove_academylocationimage_location_and_more'),
+        ('lesson', '0006_booking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonSummary',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('city', models.CharField(max_length=20)),
+                ('district', models.CharField(blank=True, default='', max_length=20)),
+                ('day', models.DateField()),
+                ('lesson_count', models.PositiveIntegerField(default=0)),
+                ('seat_count', models.IntegerField(default=0)),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='user.genre')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lessonsummary',
+            index=models.Index(fields=['city', 'day', 'district', 'genre'], name='summary_city_day_idx'),
+        ),
+    ]
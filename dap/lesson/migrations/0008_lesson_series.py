@@ -0,0 +1,70 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('util', '0003_calendar_indexes'),
+        ('user', '0011_remove_academylocationimage_location_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('lesson', '0007_lesson_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonSeries',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.CharField(blank=True, max_length=1000, null=True)),
+                ('rule', models.CharField(max_length=500)),
+                ('duration', models.DurationField()),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('price', models.PositiveIntegerField(default=0)),
+                ('recruit_number', models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='lesson',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='util.location'),
+        ),
+        migrations.AddField(
+            model_name='lessonseries',
+            name='academy',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='user.academy'),
+        ),
+        migrations.AddField(
+            model_name='lessonseries',
+            name='genre',
+            field=models.ManyToManyField(related_name='lesson_series', to='user.genre'),
+        ),
+        migrations.AddField(
+            model_name='lessonseries',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='util.location'),
+        ),
+        migrations.AddField(
+            model_name='lessonseries',
+            name='mentor',
+            field=models.ManyToManyField(related_name='lesson_series', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='series',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='lesson.lessonseries'),
+        ),
+        migrations.AddConstraint(
+            model_name='lesson',
+            constraint=models.UniqueConstraint(fields=('series', 'started_at'), name='lesson_series_occurrence_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='lessonseries',
+            index=models.Index(fields=['started_at', 'finished_at'], name='series_started_finished_idx'),
+        ),
+    ]
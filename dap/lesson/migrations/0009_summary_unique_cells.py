@@ -0,0 +1,30 @@
+# Generated by Django 4.0.5 on 2026-10-18 19:16
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_cells(apps, schema_editor):
+    # concurrent refreshes each inserted a full count of the cell; keep the newest.
+    LessonSummary = apps.get_model('lesson', 'LessonSummary')
+    keep = LessonSummary.objects.values('city', 'district', 'genre', 'day').annotate(keep=Max('id')).values('keep')
+    LessonSummary.objects.exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lesson', '0008_lesson_series'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_cells, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='lessonsummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('genre__isnull', False)), fields=('city', 'district', 'genre', 'day'), name='summary_genre_cell_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='lessonsummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('genre__isnull', True)), fields=('city', 'district', 'day'), name='summary_all_genre_cell_unique'),
+        ),
+    ]
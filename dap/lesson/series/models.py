@@ -0,0 +1,65 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from util.location.models import Location
+User = get_user_model()
+
+
+class LessonSeriesQuerySet(models.QuerySet):
+    """LessonSeries QuerySet."""
+
+    def in_window(self, start, end):
+        """Series which may have occurrences within [start, end)."""
+        return self.filter(started_at__lt=end).filter(
+            models.Q(finished_at=None) | models.Q(finished_at__gt=start))
+
+    def for_list(self):
+        """Load everything LessonListSerializer reads from occurrences in a fixed number of queries."""
+        return self.select_related('academy', 'location').prefetch_related(
+            models.Prefetch('genre', queryset=Genre.objects.only('id', 'name')),
+            models.Prefetch('mentor', queryset=User.objects.only('id', 'username'))
+        )
+
+
+class LessonSeries(models.Model):
+    """Recurring Lesson Model.
+
+    Occurrences are expanded from rule on read and stored as Lesson rows
+    only when someone participates in them.
+
+    Attributes:
+        title (str): lessons' name.
+        description (str): lessons' specific description.
+        rule (str): iCalendar recurrence rule with local DTSTART.
+            ex) "DTSTART:20221101T190000\\nRRULE:FREQ=WEEKLY;BYDAY=TU;COUNT=12"
+        duration (Duration): length of each occurrence.
+        started_at (DateTime): first occurrence's start time.
+        finished_at (DateTime): last occurrence's finish time. None if endless.
+        academy (Academy): academy where lessons take.
+        price (PositiveInt): price of each occurrence.
+        mentor (User): lessons' mentors.
+        recruit_number (PositiveSmallInt): recruit number of each occurrence.
+        genre (Genre): lessons' genres.
+        location (Location): location shared by every occurrence.
+    """
+    id = models.AutoField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.CharField(max_length=1000, null=True, blank=True)
+    rule = models.CharField(max_length=500)
+    duration = models.DurationField()
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    academy = models.ForeignKey(Academy, on_delete=models.CASCADE, null=True)
+    price = models.PositiveIntegerField(default=0)
+    mentor = models.ManyToManyField(User, related_name="lesson_series")
+    recruit_number = models.PositiveSmallIntegerField(default=0)
+    genre = models.ManyToManyField(Genre, related_name="lesson_series")
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, null=True)
+
+    objects = LessonSeriesQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['started_at', 'finished_at'], name='series_started_finished_idx'),
+        ]
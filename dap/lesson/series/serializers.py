@@ -0,0 +1,91 @@
+from datetime import timedelta
+from rest_framework import serializers
+from lesson.series.models import LessonSeries
+from lesson.series.utils import parse_rule, rule_bounds
+from util.location.serializers import LocationSerializer
+from util.location.utils import set_location
+from dap.errors import FieldError
+from dap.instrumentation import TimedDataMixin
+from user.core.genre.utils import genre_names
+
+
+class LessonSeriesCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LessonSeries
+        fields = (
+            'title',
+            'description',
+            'rule',
+            'duration',
+            'academy',
+            'price',
+            'recruit_number'
+        )
+        extra_kwargs = {
+            'title': {'required': True},
+        }
+
+    def create(self, validated_data: dict) -> LessonSeries:
+        started_at, finished_at = rule_bounds(validated_data['rule'], validated_data['duration'])
+        location = set_location(data=self.context, type="lesson", name=f"series/{validated_data['title']}")
+        series = LessonSeries.objects.create(
+            **validated_data,
+            started_at=started_at,
+            finished_at=finished_at,
+            location=location)
+        series.genre.set(self.context['genres'])
+        series.mentor.set(self.context['mentors'])
+        return series
+
+    def validate(self, data: dict) -> dict:
+        if not self.context.get('location'):
+            raise FieldError("location required.")
+        if not self.context.get('mentors'):
+            raise FieldError("mentors required.")
+        if not self.context.get('genres'):
+            raise FieldError("genres required.")
+        parse_rule(data['rule'])
+        if data['duration'] <= timedelta(0):
+            raise FieldError("duration should be positive.")
+        if data.get('price', 0) < 0:
+            raise FieldError("price should be positive.")
+        if data.get('recruit_number', 0) < 0:
+            raise FieldError("recruit_number should be positive.")
+        return data
+
+
+class LessonSeriesRetrieveSerializer(TimedDataMixin, serializers.ModelSerializer):
+    mentors = serializers.SerializerMethodField()
+    genres = serializers.SerializerMethodField()
+    location = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LessonSeries
+        fields = (
+            'id',
+            'title',
+            'description',
+            'rule',
+            'duration',
+            'started_at',
+            'finished_at',
+            'academy',
+            'price',
+            'recruit_number',
+            'mentors',
+            'genres',
+            'location'
+        )
+        extra_kwargs = {
+            'started_at': {'format': '%Y-%m-%dT%H:%M'},
+            'finished_at': {'format': '%Y-%m-%dT%H:%M'}
+        }
+
+    def get_genres(self, series):
+        return genre_names(series)
+
+    def get_mentors(self, series):
+        return [(mentor.id, mentor.username) for mentor in series.mentor.all()]
+
+    def get_location(self, series):
+        return LocationSerializer(series.location).data
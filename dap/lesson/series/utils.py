@@ -0,0 +1,135 @@
+from datetime import datetime
+from dateutil.rrule import rrulestr
+from django.db import transaction
+from django.utils import timezone
+from dap.errors import FieldError
+from lesson.lesson.models import Lesson
+from lesson.series.models import LessonSeries
+from util.version.utils import bump
+
+SERIES_CITIES_KEY = "lesson-series:cities"
+# (SERIES_CITIES_KEY version, cities having a series) of this process.
+_series_cities = (None, frozenset())
+
+
+def parse_rule(rule: str):
+    """Parse iCalendar recurrence rule into a naive, local rruleset."""
+    try:
+        rules = rrulestr(rule, forceset=True)
+        first = rules[0]
+    except (ValueError, TypeError, IndexError):
+        raise FieldError("invalid rule.")
+    if first.tzinfo:
+        raise FieldError("rule DTSTART should be local time without timezone.")
+    return rules
+
+
+def rule_bounds(rule: str, duration) -> tuple:
+    """(first start, last finish) of rule. last finish is None if endless."""
+    rules = parse_rule(rule)
+    first = timezone.make_aware(rules[0])
+    if any(r._count is None and r._until is None for r in rules._rrule):
+        return first, None
+    last = rules.before(datetime.max, inc=True)
+    return first, timezone.make_aware(last) + duration
+
+
+def _local(value: datetime) -> datetime:
+    if timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+class Occurrence:
+    """Not yet materialized occurrence of a LessonSeries.
+
+    Exposes the attributes LessonListSerializer reads from a Lesson,
+    so it serializes like one with id None.
+    """
+    id = None
+
+    def __init__(self, series: LessonSeries, started_at: datetime):
+        self.series = series
+        self.series_id = series.id
+        self.started_at = started_at
+        self.finished_at = started_at + series.duration
+        self.title = series.title
+        self.price = series.price
+        self.recruit_number = series.recruit_number
+        self.academy = series.academy
+        self.location = series.location
+        self.genre = series.genre
+        self.mentor = series.mentor
+
+
+def series_cities(version: int = None) -> frozenset:
+    """Cities any lesson series is held in.
+
+    Loaded once per SERIES_CITIES_KEY version, which series writes bump,
+    so lists of other cities skip the series query. Without version it is
+    read every time.
+    """
+    global _series_cities
+    cached_version, cities = _series_cities
+    if version is None or version != cached_version:
+        cities = frozenset(LessonSeries.objects.exclude(
+            location__city=None
+        ).values_list('location__city', flat=True).distinct())
+        if version is not None:
+            _series_cities = (version, cities)
+    return cities
+
+
+def invalidate_series_cities() -> None:
+    """Make every process reload series_cities."""
+    bump(SERIES_CITIES_KEY)
+
+
+def expand(series_list, start: datetime, end: datetime) -> list:
+    """Occurrences of series within [start, end) not materialized yet, latest first."""
+    series_list = list(series_list)
+    if not series_list:
+        return []
+    start, end = timezone.make_aware(_local(start)), timezone.make_aware(_local(end))
+    materialized = set(Lesson.objects.filter(
+        series__in=series_list,
+        started_at__gte=start,
+        started_at__lt=end
+    ).values_list('series_id', 'started_at'))
+    occurrences = []
+    for series in series_list:
+        last = _local(end - series.duration)
+        for started_at in parse_rule(series.rule).between(_local(start), last, inc=True):
+            if started_at == last:
+                continue
+            started_at = timezone.make_aware(started_at)
+            if (series.id, started_at) not in materialized:
+                occurrences.append(Occurrence(series, started_at))
+    occurrences.sort(key=lambda occurrence: occurrence.started_at, reverse=True)
+    return occurrences
+
+
+@transaction.atomic()
+def materialize(series: LessonSeries, started_at: datetime) -> Lesson:
+    """Lesson row of an occurrence, created on first use."""
+    local = _local(started_at)
+    if local not in parse_rule(series.rule).between(local, local, inc=True):
+        raise FieldError("not an occurrence of the series.")
+    started_at = timezone.make_aware(local)
+    lesson, created = Lesson.objects.get_or_create(
+        series=series,
+        started_at=started_at,
+        defaults={
+            'title': series.title,
+            'description': series.description,
+            'finished_at': started_at + series.duration,
+            'academy': series.academy,
+            'price': series.price,
+            'recruit_number': series.recruit_number,
+            'location': series.location
+        }
+    )
+    if created:
+        lesson.genre.set(series.genre.all())
+        lesson.mentor.set(series.mentor.all())
+    return lesson
@@ -0,0 +1,60 @@
+from datetime import datetime
+from rest_framework import status, viewsets, permissions, generics
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from django.db import transaction
+from django.utils import timezone
+from dap.errors import NotAllowed, FieldError, AnonymousError
+from lesson.lesson.models import Lesson
+from lesson.lesson.serializers import LessonRetrieveSerializer
+from lesson.lesson.utils import reserve_seat
+from lesson.series.models import LessonSeries
+from lesson.series.serializers import LessonSeriesCreateSerializer, LessonSeriesRetrieveSerializer
+from lesson.series.utils import materialize
+
+
+class LessonSeriesViewSet(viewsets.GenericViewSet, generics.RetrieveDestroyAPIView):
+    queryset = LessonSeries.objects.for_list()
+    permission_classes = [permissions.AllowAny]
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return LessonSeriesCreateSerializer
+        elif self.action == "participate":
+            return LessonRetrieveSerializer
+        return LessonSeriesRetrieveSerializer
+
+    @transaction.atomic()
+    def create(self, request):
+        if not getattr(request.user, 'mentor_id', None):
+            raise NotAllowed("only mentor can create lesson.")
+        data = request.data
+        serializer = self.get_serializer(
+            data=data,
+            context={
+                'location': data.get('location'),
+                'genres': data.get('genres'),
+                'mentors': data.get('mentors')
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        series = serializer.save()
+        return Response({"id": series.id, "status": "success"}, status=status.HTTP_201_CREATED)
+
+    @action(methods=["GET"], detail=True)
+    def participate(self, request, pk=None):
+        """Materialize an occurrence on first booking and participate in it."""
+        if not request.user.is_authenticated:
+            raise AnonymousError()
+        try:
+            started_at = datetime.strptime(request.query_params.get('started_at', ''), '%Y-%m-%dT%H:%M')
+        except ValueError:
+            raise FieldError("started_at should be %Y-%m-%dT%H:%M.")
+        if timezone.make_aware(started_at) <= timezone.now():
+            raise FieldError("Lesson overdue.")
+        # an occurrence nobody could book is not left materialized.
+        with transaction.atomic():
+            lesson = materialize(self.get_object(), started_at)
+            reserve_seat(lesson.id, request.user)
+        lesson = Lesson.objects.for_retrieve().get(pk=lesson.id)
+        return Response(self.get_serializer(lesson).data, status=status.HTTP_200_OK)
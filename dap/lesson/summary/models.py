@@ -0,0 +1,42 @@
+from django.db import models
+from user.core.genre.models import Genre
+
+
+class LessonSummary(models.Model):
+    """Denormalized Lesson Calendar Model.
+
+    One row per (city, district, genre, day) cell, unique, maintained by
+    lesson.summary.signals. Rows with genre None count every genre,
+    so lessons with several genres are counted once there.
+
+    Attributes:
+        city (str): lessons' city.
+        district (str): lessons' district. empty if unknown.
+        genre (Genre): lessons' genre. None for all genres.
+        day (Date): lessons' local start date.
+        lesson_count (int): counts of lessons.
+        seat_count (int): sum of lessons' remaining recruit_number.
+    """
+    id = models.BigAutoField(primary_key=True)
+    city = models.CharField(max_length=20)
+    district = models.CharField(max_length=20, blank=True, default='')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, null=True, related_name="+")
+    day = models.DateField()
+    lesson_count = models.PositiveIntegerField(default=0)
+    seat_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'day', 'district', 'genre'], name='summary_city_day_idx'),
+        ]
+        # NULL genres never collide in a plain unique constraint, so all-genre cells get their own.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['city', 'district', 'genre', 'day'],
+                condition=models.Q(genre__isnull=False),
+                name='summary_genre_cell_unique'),
+            models.UniqueConstraint(
+                fields=['city', 'district', 'day'],
+                condition=models.Q(genre__isnull=True),
+                name='summary_all_genre_cell_unique'),
+        ]
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from lesson.lesson.models import Lesson
+from lesson.lesson.signals import seats_changed, lessons_created
+from lesson.summary.utils import cells_of, refresh, apply_seat_delta
+
+
+@receiver(pre_save, sender=Lesson)
+@receiver(pre_delete, sender=Lesson)
+def capture_lesson_cells(sender, instance, **kwargs):
+    """Remember cells lesson counted in before the change."""
+    instance._summary_cells = cells_of([instance.pk]) if instance.pk else set()
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def refresh_lesson_cells(sender, instance, **kwargs):
+    """Recompute cells lesson counted in before and after the change."""
+    refresh(getattr(instance, '_summary_cells', set()) | cells_of([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Lesson.genre.through)
+def refresh_genre_cells(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recompute cells of lessons whose genres changed."""
+    if reverse:
+        lesson_ids = list(pk_set) if pk_set else list(instance.lessons.values_list('id', flat=True))
+    else:
+        lesson_ids = [instance.pk]
+    if action.startswith('pre_'):
+        instance._summary_cells = cells_of(lesson_ids)
+    else:
+        refresh(getattr(instance, '_summary_cells', set()) | cells_of(lesson_ids))
+
+
+@receiver(seats_changed)
+def update_seat_cells(sender, lesson_id, joined, left, **kwargs):
+    """Move open seats of lesson's cells once the booking commits.
+
+    Every lesson of a city and day shares a cell, so updating it inside
+    the booking transaction would serialize bookings of different lessons.
+    """
+    delta = len(left) - len(joined)
+    transaction.on_commit(lambda: apply_seat_delta(lesson_id, delta))
+
+
+@receiver(lessons_created)
+def refresh_created_lesson_cells(sender, lesson_ids, **kwargs):
+    """Recompute cells of bulk created lessons."""
+    refresh(cells_of(lesson_ids))
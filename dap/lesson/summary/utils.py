@@ -0,0 +1,120 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction, IntegrityError
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from lesson.lesson.models import Lesson
+from lesson.summary.models import LessonSummary
+
+
+def _with_day(queryset):
+    return queryset.annotate(day=TruncDate('started_at', tzinfo=timezone.get_current_timezone()))
+
+
+def _cells_q(cells: set) -> Q:
+    q = Q(pk__in=[])
+    for city, district, genre, day in cells:
+        q |= Q(city=city, district=district, genre=genre, day=day)
+    return q
+
+
+def cells_of(lesson_ids: list) -> set:
+    """(city, district, genre_id, day) cells lessons count in, including the all-genre cells."""
+    rows = _with_day(
+        Lesson.objects.filter(id__in=lesson_ids).exclude(location__city=None)
+    ).values_list('location__city', 'location__district', 'genre', 'day')
+    cells = set()
+    for city, district, genre, day in rows:
+        cells.add((city, district or '', None, day))
+        if genre:
+            cells.add((city, district or '', genre, day))
+    return cells
+
+
+def _aggregate(lessons) -> list:
+    """Summary rows of lessons."""
+    per_genre = lessons.exclude(genre=None).values(
+        'location__city', 'location__district', 'genre', 'day'
+    ).annotate(lessons=Count('id'), seats=Sum('recruit_number'))
+    all_genres = lessons.values(
+        'location__city', 'location__district', 'day'
+    ).annotate(lessons=Count('id'), seats=Sum('recruit_number'))
+    return [
+        LessonSummary(
+            city=row['location__city'],
+            district=row['location__district'] or '',
+            genre_id=row.get('genre'),
+            day=row['day'],
+            lesson_count=row['lessons'],
+            seat_count=row['seats'] or 0
+        ) for row in list(per_genre) + list(all_genres)
+    ]
+
+
+def _key(row: LessonSummary) -> tuple:
+    return (row.city, row.district, row.genre_id, row.day)
+
+
+@transaction.atomic()
+def refresh(cells: set, retries: int = 1) -> None:
+    """Recompute the given cells from Lesson table.
+
+    Stored cells are locked before the lessons are counted, then updated in
+    place, and cells without lessons left are deleted. Cells a concurrent
+    refresh inserts first fail the unique constraint, and the refresh is
+    retried once with those rows locked.
+    """
+    if not cells:
+        return
+    existing = {
+        _key(row): row
+        for row in LessonSummary.objects.select_for_update().filter(_cells_q(cells))
+    }
+    tz = timezone.get_current_timezone()
+    days = {cell[3] for cell in cells}
+    lessons = _with_day(Lesson.objects.filter(
+        location__city__in={cell[0] for cell in cells},
+        started_at__gte=datetime.combine(min(days), time.min, tzinfo=tz),
+        started_at__lt=datetime.combine(max(days) + timedelta(days=1), time.min, tzinfo=tz)
+    ))
+    fresh = {_key(row): row for row in _aggregate(lessons) if _key(row) in cells}
+    changed = []
+    for key, row in fresh.items():
+        current = existing.get(key)
+        if current and (current.lesson_count, current.seat_count) != (row.lesson_count, row.seat_count):
+            current.lesson_count, current.seat_count = row.lesson_count, row.seat_count
+            changed.append(current)
+    LessonSummary.objects.filter(id__in=[row.id for key, row in existing.items() if key not in fresh]).delete()
+    LessonSummary.objects.bulk_update(changed, ['lesson_count', 'seat_count'])
+    try:
+        with transaction.atomic():
+            LessonSummary.objects.bulk_create([row for key, row in fresh.items() if key not in existing])
+    except IntegrityError:
+        if not retries:
+            raise
+        refresh(cells, retries - 1)
+
+
+def apply_seat_delta(lesson_id: int, delta: int) -> None:
+    """Add delta to open seats of lesson's cells."""
+    cells = cells_of([lesson_id])
+    if cells and delta:
+        LessonSummary.objects.filter(_cells_q(cells)).update(seat_count=F('seat_count') + delta)
+
+
+def day_counts(lessons) -> dict:
+    """day -> {'day', 'lessons', 'seats'} of lessons, each lesson counted once."""
+    lessons = Lesson.objects.filter(id__in=lessons.values('id'))
+    return {
+        row['day']: row for row in _with_day(lessons).values('day').annotate(
+            lessons=Count('id'),
+            seats=Sum('recruit_number'))
+    }
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Recompute the whole summary table."""
+    rows = _aggregate(_with_day(Lesson.objects.exclude(location__city=None)))
+    LessonSummary.objects.all().delete()
+    LessonSummary.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from lesson.lesson.models import Lesson
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from util.location.models import Location
+User = get_user_model()
+
+# indexes of lesson 0004_calendar_indexes and util 0003_calendar_indexes.
+INDEXES = ('lesson_started_finished_idx', 'lesson_genre_genre_lesson_idx', 'location_city_district_idx')
+
+
+@skipUnless(connection.vendor in ('postgresql', 'sqlite'), "EXPLAIN output is read for PostgreSQL and SQLite.")
+class CalendarIndexTest(TestCase):
+    """Plans of the calendar and list queries use the calendar indexes."""
+
+    def setUp(self):
+        self.genres = [Genre.objects.create(name=name) for name in ("hiphop", "popping")]
+        academy = Academy.objects.create(
+            name="academy",
+            location=Location.objects.create(type="academy", detail="a", city="서울특별시", district="마포구"))
+        self.month = timezone.localdate().replace(day=1)
+        started_at = timezone.make_aware(datetime.combine(self.month, datetime.min.time())) + timedelta(hours=10)
+        for i in range(10):
+            lesson = Lesson.objects.create(
+                title=f"lesson {i}",
+                started_at=started_at + timedelta(days=i % 28),
+                finished_at=started_at + timedelta(days=i % 28, hours=1),
+                academy=academy,
+                price=1000,
+                recruit_number=10,
+                location=Location.objects.create(type="lesson", detail=f"l{i}", city="서울특별시", district="마포구"))
+            lesson.genre.set(self.genres)
+
+    def lesson_queries(self, url: str, params: dict) -> list:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in context.captured_queries if '"lesson_lesson_genre"' in query['sql']]
+
+    def plan(self, sql: str) -> str:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # a few rows are cheaper to scan, so make scans the last resort.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}")
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def assertUsesIndex(self, sql: str):
+        plan = self.plan(sql)
+        self.assertTrue(any(index in plan for index in INDEXES), f"no calendar index in plan:\n{plan}")
+
+    def test_calendar_query_uses_index(self):
+        queries = self.lesson_queries('/lesson/calendar/', {
+            'city': "서울특별시",
+            'year': self.month.year,
+            'month': self.month.month,
+            'genres': [genre.id for genre in self.genres],
+        })
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertUsesIndex(sql)
+
+    def test_list_query_uses_index(self):
+        queries = self.lesson_queries('/lesson/', {
+            'city': "서울특별시",
+            'month': 10,
+            'day': 2 if timezone.localdate().day != 2 else 3,
+            'genres': self.genres[0].id,
+        })
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertUsesIndex(sql)
@@ -0,0 +1,74 @@
+from datetime import date, datetime, timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from lesson.lesson.cache import cache_stats, HIT, MISS
+from lesson.lesson.models import Lesson
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import Mentor
+from util.location.models import Location
+User = get_user_model()
+
+
+class LessonListQueryTest(TestCase):
+
+    def setUp(self):
+        self.genre = Genre.objects.create(name="hiphop")
+        self.academy = Academy.objects.create(
+            name="academy",
+            location=Location.objects.create(type="academy", detail="a", city="서울특별시", district="마포구"))
+        self.mentor = User.objects.create(
+            email="mentor@dap.com",
+            username="mentor",
+            birth=date(1990, 1, 1),
+            gender="male",
+            mentor=Mentor.objects.create(started_at=date(2020, 1, 1)))
+        # list reads a single day of 2022 when day is given and is not today.
+        self.day = 2 if timezone.localdate().day != 2 else 3
+        self.params = {'genres': self.genre.id, 'city': "서울특별시", 'month': 10, 'day': self.day}
+
+    def create_lessons(self, count: int):
+        started_at = timezone.make_aware(datetime(2022, 10, self.day, 10))
+        for i in range(count):
+            lesson = Lesson.objects.create(
+                title=f"lesson {i}",
+                started_at=started_at + timedelta(minutes=i),
+                finished_at=started_at + timedelta(hours=1, minutes=i),
+                academy=self.academy,
+                price=1000,
+                recruit_number=10,
+                location=Location.objects.create(type="lesson", detail=f"l{i}", city="서울특별시", district="마포구"))
+            lesson.genre.set([self.genre])
+            lesson.mentor.set([self.mentor])
+
+    def list(self):
+        # drop cached pages, so every call computes the page.
+        cache.clear()
+        return self.client.get('/lesson/', self.params)
+
+    def test_query_count_does_not_grow_with_page(self):
+        self.create_lessons(2)
+        self.list()  # loads process-wide genre names and series cities.
+        with CaptureQueriesContext(connection) as context:
+            response = self.list()
+        queries = len(context)
+        self.assertEqual(len(response.data), 2)
+
+        self.create_lessons(18)
+        self.list()
+        with self.assertNumQueries(queries):
+            response = self.list()
+        self.assertEqual(len(response.data), 20)
+
+    def test_cache_counters(self):
+        self.create_lessons(1)
+        before = cache_stats()
+        self.assertEqual(self.list()['X-Cache'], MISS)
+        self.assertEqual(self.client.get('/lesson/', self.params)['X-Cache'], HIT)
+        after = cache_stats()
+        self.assertEqual(after[MISS] - before[MISS], 1)
+        self.assertEqual(after[HIT] - before[HIT], 1)
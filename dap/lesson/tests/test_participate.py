@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from lesson.lesson.models import Lesson
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import Mentee
+from util.location.models import Location
+User = get_user_model()
+
+SEATS = 50
+MENTEES = 200
+THREADS = 16
+
+
+class ConcurrentParticipateTest(TransactionTestCase):
+    """Concurrent participate never sells more seats than recruit_number."""
+
+    def setUp(self):
+        started_at = timezone.now() + timedelta(days=7)
+        self.lesson = Lesson.objects.create(
+            title="lesson",
+            started_at=started_at,
+            finished_at=started_at + timedelta(hours=1),
+            academy=Academy.objects.create(name="academy"),
+            price=1000,
+            recruit_number=SEATS,
+            location=Location.objects.create(type="lesson", detail="l", city="서울특별시", district="마포구"))
+        self.lesson.genre.set([Genre.objects.create(name="hiphop")])
+        self.users = [
+            User.objects.create(
+                email=f"mentee{i}@dap.com",
+                username=f"mentee{i}",
+                birth=date(1995, 1, 1),
+                gender="female",
+                contact=f"010{i:08d}",
+                mentee=Mentee.objects.create(started_at=date(2021, 1, 1)))
+            for i in range(MENTEES)
+        ]
+
+    def participate(self, user) -> int:
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            return client.get(f'/lesson/{self.lesson.id}/participate/').status_code
+        finally:
+            # each thread opened its own connection.
+            connection.close()
+
+    def test_no_overbooking(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(self.participate, self.users))
+        self.lesson.refresh_from_db()
+        self.assertEqual(statuses.count(200), SEATS)
+        # the rest are turned away as overcrowded, not failed.
+        self.assertEqual(statuses.count(400), MENTEES - SEATS)
+        self.assertEqual(self.lesson.recruit_number, 0)
+        self.assertEqual(self.lesson.mentee.count(), SEATS)
@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from dap.instrumentation import query_budget
+from lesson.lesson.models import Lesson
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import Mentor, Mentee
+from util.location import geo
+from util.location.models import Location, LocationImage
+User = get_user_model()
+
+LESSONS = 20
+
+
+class LessonBudgetMixin:
+    """Lessons of a full list page, and budget assertion of lesson endpoints."""
+
+    def setUp(self):
+        self.genres = [Genre.objects.create(name=name) for name in ("hiphop", "popping")]
+        location = Location.objects.create(type="academy", detail="a", city="서울특별시", district="마포구")
+        LocationImage.objects.create(location=location, name="academy/1")
+        academy = Academy.objects.create(name="academy", location=location)
+        mentors = []
+        for i in range(3):
+            mentor = Mentor.objects.create(started_at=date(2020, 1, 1))
+            mentor.genre.set(self.genres)
+            mentor.academy.set([academy])
+            mentors.append(User.objects.create(
+                email=f"mentor{i}@dap.com",
+                username=f"mentor{i}",
+                birth=date(1990, 1, 1),
+                gender="male",
+                contact=f"010{i:08d}",
+                mentor=mentor))
+        # list reads a single day of 2022 when day is given and is not today.
+        self.day = 2 if timezone.localdate().day != 2 else 3
+        listed_at = timezone.make_aware(datetime(2022, 10, self.day, 10))
+        upcoming_at = timezone.now() + timedelta(days=1)
+        self.lessons = []
+        for i in range(LESSONS * 2):
+            started_at = (listed_at if i % 2 else upcoming_at) + timedelta(minutes=i)
+            lesson = Lesson.objects.create(
+                title=f"lesson {i}",
+                description="lesson",
+                started_at=started_at,
+                finished_at=started_at + timedelta(hours=1),
+                academy=academy,
+                price=1000,
+                recruit_number=10,
+                location=Location.objects.create(
+                    type="lesson",
+                    detail=f"l{i}",
+                    city="서울특별시",
+                    district="마포구",
+                    latitude=37.55,
+                    longitude=126.92,
+                    geohash=geo.encode(37.55, 126.92)))
+            lesson.genre.set(self.genres)
+            lesson.mentor.set(mentors)
+            self.lessons.append(lesson)
+        user = User.objects.create(
+            email="mentee@dap.com",
+            username="mentee",
+            birth=date(1995, 1, 1),
+            gender="female",
+            mentee=Mentee.objects.create(started_at=date(2021, 1, 1)))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+
+    def assertWithinBudget(self, tag: str, url: str, params: dict = None):
+        # the first request warms process-wide caches: token, genre names, series cities.
+        self.client.get(url, params)
+        cache.clear()
+        with query_budget(tag):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def list_params(self):
+        return {'genres': self.genres[0].id, 'city': "서울특별시", 'month': 10, 'day': self.day}
+
+
+class LessonQueryBudgetTest(LessonBudgetMixin, TestCase):
+    """Every budgeted lesson endpoint stays within QUERY_BUDGETS with a full page."""
+
+    def test_list(self):
+        response = self.assertWithinBudget('lesson.list', '/lesson/', self.list_params())
+        self.assertEqual(len(response.data), LESSONS)
+
+    def test_retrieve(self):
+        self.assertWithinBudget('lesson.retrieve', f'/lesson/{self.lessons[0].id}/')
+
+    def test_search(self):
+        response = self.assertWithinBudget('lesson.search', '/lesson/search/', {'keyword': "lesson"})
+        self.assertEqual(len(response.data), LESSONS)
+
+    def test_nearby(self):
+        response = self.assertWithinBudget('lesson.nearby', '/lesson/nearby/', {'lat': 37.55, 'lng': 126.92})
+        self.assertTrue(response.data)
+
+    def test_calendar(self):
+        for genres in ([self.genres[0].id], [genre.id for genre in self.genres]):
+            self.assertWithinBudget('lesson.calendar', '/lesson/calendar/', {'city': "서울특별시", 'genres': genres})
+
+
+
+class AsyncLessonQueryBudgetTest(LessonBudgetMixin, TransactionTestCase):
+    """Async views query from the thread pool, so their data must be committed."""
+
+    def test_async_list(self):
+        response = self.assertWithinBudget('lesson-async.list', '/async/lesson/', self.list_params())
+        self.assertEqual(len(response.json()), LESSONS)
+
+    def test_async_retrieve(self):
+        self.assertWithinBudget('lesson-async.retrieve', f'/async/lesson/{self.lessons[0].id}/')
+
+    def test_async_search(self):
+        self.assertWithinBudget('lesson-async.search', '/async/lesson/search/', {'keyword': "lesson"})
@@ -1,13 +1,20 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 from lesson.lesson.views import LessonViewSet
+from lesson.lesson.async_views import lesson_list, lesson_retrieve, lesson_search
+from lesson.series.views import LessonSeriesViewSet
 
 app_name = 'lesson'
 
 router = SimpleRouter()
 router.register('lesson', LessonViewSet, basename='lesson')
+router.register('lesson-series', LessonSeriesViewSet, basename='lesson-series')
 
 
 urlpatterns = [
     path('', include((router.urls))),
+    # async (ASGI) versions of the read-heavy lesson endpoints.
+    path('async/lesson/', lesson_list),
+    path('async/lesson/search/', lesson_search),
+    path('async/lesson/<int:pk>/', lesson_retrieve),
 ]
@@ -0,0 +1,190 @@
+"""
+In-Memory Autocomplete Index
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from django.contrib.auth import get_user_model
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from util.version.utils import get_version, bump
+User = get_user_model()
+
+VERSION_KEY = "autocomplete:version"
+# Seconds a process trusts its index before checking the shared version.
+CHECK_INTERVAL = 5
+
+ACADEMY = "academies"
+GENRE = "genres"
+MENTOR = "mentors"
+KINDS = (ACADEMY, GENRE, MENTOR)
+LIMIT = 10
+MAX_LIMIT = 50
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# Compound jamo are typed as two keys, so they are indexed as two.
+COMPOUND = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+
+def jamo(text: str) -> str:
+    """Casefolded text with Hangul syllables decomposed into keystroke jamo.
+
+    ex) "마포" -> "ㅁㅏㅍㅗ", so "맢" (ㅁㅏㅍ) typed halfway already matches.
+    """
+    keys = []
+    for char in unicodedata.normalize('NFC', ' '.join(str(text or '').split())).casefold():
+        code = ord(char)
+        if SYLLABLE_BASE <= code <= SYLLABLE_LAST:
+            index = code - SYLLABLE_BASE
+            parts = (CHOSEONG[index // 588], JUNGSEONG[index % 588 // 28], JONGSEONG[index % 28])
+        else:
+            parts = (char,)
+        keys.extend(COMPOUND.get(part, part) for part in parts)
+    return ''.join(keys)
+
+
+def initials(text: str) -> str:
+    """Choseong of every Hangul syllable of text, None if it has none. ex) "마포" -> "ㅁㅍ" """
+    keys = [
+        CHOSEONG[(ord(char) - SYLLABLE_BASE) // 588]
+        for char in str(text or '')
+        if SYLLABLE_BASE <= ord(char) <= SYLLABLE_LAST
+    ]
+    return ''.join(keys) or None
+
+
+class PrefixIndex:
+    """Sorted array of (key, name, id) answering prefix queries by bisection.
+
+    Every name is stored under its jamo key and, if Hangul, its initials.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.keys = {}
+
+    def _keys_of(self, name: str) -> list:
+        keys = [jamo(name)]
+        if initials(name) and initials(name) != keys[0]:
+            keys.append(initials(name))
+        return keys
+
+    def add(self, id: int, name: str) -> None:
+        self.remove(id)
+        self.keys[id] = [(key, name, id) for key in self._keys_of(name)]
+        for entry in self.keys[id]:
+            insort(self.entries, entry)
+
+    def remove(self, id: int) -> None:
+        for entry in self.keys.pop(id, []):
+            index = bisect_left(self.entries, entry)
+            if index < len(self.entries) and self.entries[index] == entry:
+                del self.entries[index]
+
+    def search(self, prefix: str, limit: int) -> list:
+        """[(id, name)] whose name starts with prefix, in key order."""
+        prefix = jamo(prefix)
+        if not prefix:
+            return []
+        found, seen = [], set()
+        index = bisect_left(self.entries, (prefix,))
+        while index < len(self.entries) and len(found) < limit:
+            key, name, id = self.entries[index]
+            if not key.startswith(prefix):
+                break
+            if id not in seen:
+                seen.add(id)
+                found.append((id, name))
+            index += 1
+        return found
+
+
+class Autocomplete:
+    """Process-wide academy, genre and mentor name index.
+
+    Built from the database on first use. The signals of user.signals
+    update the index of the writing process in place and bump a version in
+    the shared util.version table, which every process checks at most once
+    per CHECK_INTERVAL seconds and rebuilds from the database on change.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexes = None
+        self.version = None
+        self.checked_at = 0.0
+
+    def _build(self) -> dict:
+        indexes = {kind: PrefixIndex() for kind in KINDS}
+        for id, name in Academy.objects.values_list('id', 'name'):
+            indexes[ACADEMY].add(id, name)
+        for id, name in Genre.objects.values_list('id', 'name'):
+            indexes[GENRE].add(id, name)
+        for id, name in User.objects.filter(mentor__isnull=False).values_list('id', 'username'):
+            indexes[MENTOR].add(id, name)
+        return indexes
+
+    def _load(self) -> None:
+        version = get_version(VERSION_KEY)
+        self.indexes = self._build()
+        self.version = version
+        self.checked_at = time.monotonic()
+
+    def _indexes(self) -> dict:
+        indexes = self.indexes
+        if indexes is None or time.monotonic() - self.checked_at > CHECK_INTERVAL:
+            with self.lock:
+                if self.indexes is None:
+                    self._load()
+                elif time.monotonic() - self.checked_at > CHECK_INTERVAL:
+                    if get_version(VERSION_KEY) != self.version:
+                        self._load()
+                    else:
+                        self.checked_at = time.monotonic()
+                indexes = self.indexes
+        return indexes
+
+    def _changed(self, change) -> None:
+        """Apply change to the local index and announce it to the others."""
+        version = bump(VERSION_KEY)
+        with self.lock:
+            if self.indexes is None:
+                return
+            change(self.indexes)
+            # skip the rebuild only if no other process wrote in between.
+            if self.version == version - 1:
+                self.version = version
+
+    def add(self, kind: str, id: int, name: str) -> None:
+        self._changed(lambda indexes: indexes[kind].add(id, name))
+
+    def remove(self, kind: str, id: int) -> None:
+        self._changed(lambda indexes: indexes[kind].remove(id))
+
+    def reset(self) -> None:
+        """Drop this process's index and tell the others to rebuild."""
+        bump(VERSION_KEY)
+        with self.lock:
+            self.indexes = None
+
+    def search(self, prefix: str, kinds=KINDS, limit: int = LIMIT) -> dict:
+        indexes = self._indexes()
+        with self.lock:
+            return {
+                kind: [{'id': id, 'name': name} for id, name in indexes[kind].search(prefix, limit)]
+                for kind in kinds
+            }
+
+
+autocomplete = Autocomplete()
@@ -24,6 +24,6 @@ class Academy(models.Model):
     finished_at = models.DateTimeField(blank=True, null=True)
     logo = models.ImageField(upload_to=f"academy/{name}/logo", null=True)
     url = models.CharField(blank=True, null=True, max_length=500)
-    location = models.OneToOneField(Location, on_delete=models.CASCADE, null=True)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, null=True)
     
 
@@ -5,6 +5,8 @@ from dap.const import TIME_FORMAT
 from dap.errors import FieldError, DuplicationError
 from util.location.serializers import LocationSerializer
 from util.location.utils import set_location
+from dap.loader import get_loader
+from dap.instrumentation import TimedDataMixin, TimedListSerializer
 
 User = get_user_model()
 
@@ -54,10 +56,10 @@ class AcademySerializer(serializers.ModelSerializer):
         return data
 
     def get_location(self, academy):
-        return LocationSerializer(academy.location).data
+        return LocationSerializer(get_loader().one(academy, 'location')).data
 
 
-class AcademyListSerializer(serializers.ModelSerializer):
+class AcademyListSerializer(TimedDataMixin, serializers.ModelSerializer):
     location = serializers.CharField(source='location.detail')
 
     class Meta:
@@ -69,3 +71,4 @@ class AcademyListSerializer(serializers.ModelSerializer):
             'logo',
             'contact'
         )
+        list_serializer_class = TimedListSerializer
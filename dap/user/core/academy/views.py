@@ -30,10 +30,11 @@ class AcademyViewSet(viewsets.GenericViewSet):
         page = request.query_params.get('page', '1')
         name = request.query_params.get("name")
         location = request.query_params.get("location")
+        academies = Academy.objects.select_related('location')
         if name:
-            results = Academy.objects.filter(name__icontains=name)
+            results = academies.filter(name__icontains=name).order_by('name')
         elif location:
-            results = Academy.objects.filter(location__detail__icontains=location).order_by('name')
+            results = academies.filter(location__detail__icontains=location).order_by('name')
         else: 
             results = []
         results = Paginator(results, 20).get_page(page)
@@ -35,3 +35,6 @@ GENRE_LIST = [
     G_HIP, 
     DEFAULT
 ]
+
+# Seconds a process trusts its genre registry before checking the shared version.
+REGISTRY_CHECK_INTERVAL = 5
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from user.core.genre.models import Genre
+from dap.instrumentation import TimedDataMixin, TimedListSerializer
 User = get_user_model()
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedDataMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = (
@@ -12,3 +13,4 @@ class GenreSerializer(serializers.ModelSerializer):
             'description',
             'video'
         )
+        list_serializer_class = TimedListSerializer
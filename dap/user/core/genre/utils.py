@@ -0,0 +1,175 @@
+import threading
+import time
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import connection, models
+from django.db.models.functions import Cast
+from dap.errors import FieldError
+from user.core.genre.models import Genre
+from user.core.genre.const import REGISTRY_CHECK_INTERVAL
+from util.version.utils import get_version, bump
+
+VERSION_KEY = "genre-registry:version"
+# annotation of with_genre_ids, read by attach_genre_ids.
+GENRE_IDS = "genre_ids_joined"
+
+
+class GenreRegistry:
+    """Process-wide id <-> name map of the genre table.
+
+    Loaded once per process. Genre writes bump a version in the shared
+    util.version table, which every process checks at most once per
+    REGISTRY_CHECK_INTERVAL seconds before reloading. An id or name
+    missing from the copy reloads it at once, so a genre created by another
+    process is never rejected or dropped while the check is pending.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (id -> name, name -> id), replaced together so readers never mix loads.
+        self.maps = None
+        self.version = None
+        self.checked_at = 0.0
+
+    def _load(self) -> tuple:
+        version = get_version(VERSION_KEY)
+        names = dict(Genre.objects.values_list('id', 'name'))
+        self.maps = (names, {name: id for id, name in names.items()})
+        self.version = version
+        self.checked_at = time.monotonic()
+        return self.maps
+
+    def _fresh(self) -> tuple:
+        maps = self.maps
+        if maps is None or time.monotonic() - self.checked_at > REGISTRY_CHECK_INTERVAL:
+            with self.lock:
+                if self.maps is None:
+                    self._load()
+                elif time.monotonic() - self.checked_at > REGISTRY_CHECK_INTERVAL:
+                    if get_version(VERSION_KEY) != self.version:
+                        self._load()
+                    else:
+                        self.checked_at = time.monotonic()
+                maps = self.maps
+        return maps
+
+    def _reloaded(self) -> tuple:
+        with self.lock:
+            return self._load()
+
+    def invalidate(self) -> None:
+        """Tell every process, this one included, to reload on its next read."""
+        bump(VERSION_KEY)
+        with self.lock:
+            self.version = None
+            self.checked_at = 0.0
+
+    def name_of(self, ids) -> list:
+        """Names of genre ids, unknown ids skipped."""
+        names, _ = self._fresh()
+        if not names.keys() >= set(ids):
+            names, _ = self._reloaded()
+        return [names[id] for id in ids if id in names]
+
+    def known(self, ids) -> set:
+        """Subset of ids that are genres."""
+        ids = set(ids)
+        names, _ = self._fresh()
+        if not names.keys() >= ids:
+            names, _ = self._reloaded()
+        return ids & names.keys()
+
+    def resolve(self, values) -> list:
+        """Genre ids of ids or names. raise FieldError on unknown genre."""
+        try:
+            return self._resolve(values, self._fresh())
+        except FieldError:
+            return self._resolve(values, self._reloaded())
+
+    def _resolve(self, values, maps: tuple) -> list:
+        names, by_name = maps
+        ids = []
+        for value in values or []:
+            if isinstance(value, str) and not value.isdigit():
+                id = by_name.get(value)
+            else:
+                id = int(value)
+            if id not in names:
+                raise FieldError(f"genre {value} does not exist.")
+            ids.append(id)
+        return ids
+
+
+registry = GenreRegistry()
+
+
+def _through(model):
+    through = model.genre.through
+    source = next(
+        field.attname for field in through._meta.fields
+        if field.is_relation and field.related_model is model)
+    return through, source
+
+
+class _GroupConcat(models.Aggregate):
+    function = 'GROUP_CONCAT'
+    output_field = models.CharField()
+
+
+def with_genre_ids(queryset):
+    """queryset annotated with the genre ids of each row, as "1,2".
+
+    attach_genre_ids reads them instead of querying the through table, so a
+    page without a COUNT query loads its genres with the page itself.
+    """
+    through, source = _through(queryset.model)
+    if connection.vendor == 'postgresql':
+        joined = StringAgg(Cast('genre_id', models.CharField()), ',', ordering='genre_id')
+    else:
+        # the (source, genre_id) unique index hands rows over in genre_id order.
+        joined = _GroupConcat('genre_id')
+    ids = through.objects.filter(**{source: models.OuterRef('pk')}).order_by().values(source).annotate(
+        ids=joined).values('ids')
+    return queryset.annotate(**{GENRE_IDS: models.Subquery(ids)})
+
+
+def attach_genre_ids(objects) -> None:
+    """Load genre ids of objects with one query per model on its genre through table.
+
+    Objects annotated by with_genre_ids need no query.
+    """
+    by_model = {}
+    for obj in objects:
+        if hasattr(obj, GENRE_IDS):
+            joined = getattr(obj, GENRE_IDS)
+            obj._genre_ids = [int(id) for id in joined.split(',')] if joined else []
+        elif getattr(obj, 'pk', None) is not None:
+            by_model.setdefault(type(obj), []).append(obj)
+    for model, items in by_model.items():
+        through, source = _through(model)
+        genre_ids = {obj.pk: [] for obj in items}
+        rows = through.objects.filter(**{f"{source}__in": genre_ids}).order_by('genre_id')
+        for pk, genre_id in rows.values_list(source, 'genre_id'):
+            genre_ids[pk].append(genre_id)
+        for obj in items:
+            obj._genre_ids = genre_ids[obj.pk]
+
+
+def genre_names(obj) -> list:
+    """Genre names of obj from the registry.
+
+    Uses ids attached by attach_genre_ids or a prefetched genre relation
+    when present, else reads the through table.
+    """
+    ids = getattr(obj, '_genre_ids', None)
+    if ids is None:
+        prefetched = getattr(obj, '_prefetched_objects_cache', {}).get('genre')
+        if prefetched is not None:
+            ids = [genre.id for genre in prefetched]
+        elif getattr(obj, 'pk', None) is None:
+            # not stored, like a series Occurrence: genre is its series' relation.
+            ids = [genre.id for genre in obj.genre.all()]
+        else:
+            attach_genre_ids([obj])
+            ids = obj._genre_ids
+    return registry.name_of(ids)
+
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from user.profile.search import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the mentor directory search index from scratch."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild()
+        self.stdout.write(f"indexed {count} mentors.")
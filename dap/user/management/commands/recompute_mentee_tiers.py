@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from user.profile.const import RECOMPUTE_BATCH_SIZE
+from user.profile.utils import recompute_mentees
+
+
+class Command(BaseCommand):
+    help = "Recompute courses_count and tier of every mentee from lesson participations."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=RECOMPUTE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = recompute_mentees(options['batch_size'])
+        self.stdout.write(f"recomputed {count} mentees.")
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('util', '0004_location_key'),
+        ('user', '0011_remove_academylocationimage_location_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='academy',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='util.location'),
+        ),
+    ]
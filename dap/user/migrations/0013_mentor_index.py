@@ -0,0 +1,76 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _joined(names):
+    names = sorted({' '.join(str(name or '').split()).casefold().replace('|', ' ') for name in names})
+    return '|' + ''.join(f"{name}|" for name in names)
+
+
+def fill_mentor_index(apps, schema_editor):
+    User = apps.get_model('user', 'User')
+    MentorIndex = apps.get_model('user', 'MentorIndex')
+    rows = []
+    mentors = User.objects.filter(mentor__isnull=False).select_related('mentor').prefetch_related(
+        'mentor__genre', 'mentor__academy')
+    for user in mentors.iterator(chunk_size=1000):
+        rows.append(MentorIndex(
+            user_id=user.id,
+            username=user.username,
+            name_key=' '.join(user.username.split()).casefold(),
+            genres=_joined(genre.name for genre in user.mentor.genre.all()),
+            academies=_joined(academy.name for academy in user.mentor.academy.all())
+        ))
+    MentorIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # "|name" substring lookups; trigram GIN is PostgreSQL only.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    schema_editor.execute(
+        'CREATE INDEX "mentor_index_genres_trgm" ON "user_mentorindex" USING gin ("genres" gin_trgm_ops);')
+    schema_editor.execute(
+        'CREATE INDEX "mentor_index_academies_trgm" ON "user_mentorindex" USING gin ("academies" gin_trgm_ops);')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX "mentor_index_genres_trgm";')
+    schema_editor.execute('DROP INDEX "mentor_index_academies_trgm";')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0012_academy_shared_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorIndex',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=12)),
+                ('name_key', models.CharField(max_length=12)),
+                ('genres', models.CharField(default='|', max_length=1000)),
+                ('academies', models.CharField(default='|', max_length=2000)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='mentor_index', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='mentorindex',
+            index=models.Index(fields=['name_key'], name='mentor_index_name_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='mentorindex',
+            index=models.Index(fields=['username', 'id'], name='mentor_index_order_idx'),
+        ),
+        migrations.RunPython(fill_mentor_index, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
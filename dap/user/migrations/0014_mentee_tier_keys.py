@@ -0,0 +1,35 @@
+# Generated by Django 4.0.5 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+LABELS = {
+    'Grand-Master': 'GM',
+    'Master': 'M',
+    'Pletinum': 'P',
+    'Gold': 'G',
+    'Silver': 'S',
+    'Bronze': 'B',
+    'Unranked': 'U',
+}
+
+
+def store_tier_keys(apps, schema_editor):
+    Mentee = apps.get_model('user', 'Mentee')
+    for label, key in LABELS.items():
+        Mentee.objects.filter(tier=label).update(tier=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0013_mentor_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mentee',
+            name='tier',
+            field=models.CharField(choices=[('GM', 'Grand-Master'), ('M', 'Master'), ('P', 'Pletinum'), ('G', 'Gold'), ('S', 'Silver'), ('B', 'Bronze'), ('U', 'Unranked')], default='U', max_length=10),
+        ),
+        migrations.RunPython(store_tier_keys, migrations.RunPython.noop),
+    ]
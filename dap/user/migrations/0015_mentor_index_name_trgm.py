@@ -0,0 +1,29 @@
+# Generated by Django 4.0.5 on 2026-10-18 21:02
+
+from django.db import migrations
+
+
+def create_name_trigram_index(apps, schema_editor):
+    # substring name lookups; trigram GIN is PostgreSQL only.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    schema_editor.execute(
+        'CREATE INDEX "mentor_index_name_trgm" ON "user_mentorindex" USING gin ("name_key" gin_trgm_ops);')
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX "mentor_index_name_trgm";')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0014_mentee_tier_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
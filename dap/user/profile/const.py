@@ -1,18 +1,30 @@
-GM = "Grand-Master"
-MS = "Master"
-PL = "Pletinum"
-GL = "Gold"
-SL = "Silver"
-BR = "Bronze"
-UN = "Unranked"
+GM = "GM"
+MS = "M"
+PL = "P"
+GL = "G"
+SL = "S"
+BR = "B"
+UN = "U"
 
 
 TIER = (
-    ("GM", "Grand-Master"),
-    ("M", "Master"),
-    ("P", "Pletinum"),
-    ("G", "Gold"),
-    ("S", "Silver"),
-    ("B", "Bronze"),
-    ("U", "Unranked")
+    (GM, "Grand-Master"),
+    (MS, "Master"),
+    (PL, "Pletinum"),
+    (GL, "Gold"),
+    (SL, "Silver"),
+    (BR, "Bronze"),
+    (UN, "Unranked")
 )
+
+# (minimum courses_count, tier), highest first.
+TIER_THRESHOLDS = (
+    (100, GM),
+    (50, MS),
+    (30, PL),
+    (15, GL),
+    (5, SL),
+    (1, BR),
+)
+
+RECOMPUTE_BATCH_SIZE = 1000
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from user.core.genre.models import Genre
 from user.core.academy.models import Academy
@@ -42,3 +43,29 @@ class Mentee(Profile):
     tier = models.CharField(max_length=10, choices=TIER, default=UN)
     genre = models.ManyToManyField(Genre, related_name="mentees")
     
+
+
+class MentorIndex(models.Model):
+    """Denormalized Mentor Search Row.
+
+    Maintained by user.profile.search, one row per mentor.
+
+    Attributes:
+        user (User): indexed mentor.
+        username (str): mentor's username. ordering key.
+        name_key (str): casefolded username. name lookup key.
+        genres (str): casefolded genre names as "|name|name|".
+        academies (str): casefolded academy names as "|name|name|".
+    """
+    id = models.AutoField(primary_key=True)
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="mentor_index")
+    username = models.CharField(max_length=12)
+    name_key = models.CharField(max_length=12)
+    genres = models.CharField(max_length=1000, default='|')
+    academies = models.CharField(max_length=2000, default='|')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name_key'], name='mentor_index_name_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['username', 'id'], name='mentor_index_order_idx'),
+        ]
@@ -0,0 +1,91 @@
+"""
+Mentor Directory Search Index
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import MentorIndex
+User = get_user_model()
+
+SEPARATOR = '|'
+# name and academy matching of search().
+CONTAINS = 'contains'
+PREFIX = 'prefix'
+MATCHES = (CONTAINS, PREFIX)
+
+
+def _key(value: str) -> str:
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def _joined(names) -> str:
+    """"|a|b|" of names, so any one can be matched by "|a|" or prefixed by "|a"."""
+    names = sorted({_key(name).replace(SEPARATOR, ' ') for name in names})
+    return SEPARATOR + ''.join(f"{name}{SEPARATOR}" for name in names)
+
+
+def refresh(user_ids) -> None:
+    """Rebuild index rows of users. rows of users who are no longer mentors are removed."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    mentors = User.objects.filter(id__in=user_ids, mentor__isnull=False).select_related('mentor').prefetch_related(
+        Prefetch('mentor__genre', queryset=Genre.objects.only('id', 'name')),
+        Prefetch('mentor__academy', queryset=Academy.objects.only('id', 'name'))
+    )
+    existing = {row.user_id: row for row in MentorIndex.objects.filter(user_id__in=user_ids)}
+    created, updated = [], []
+    for user in mentors:
+        row = existing.pop(user.id, None) or MentorIndex(user_id=user.id)
+        row.username = user.username
+        row.name_key = _key(user.username)
+        row.genres = _joined(genre.name for genre in user.mentor.genre.all())
+        row.academies = _joined(academy.name for academy in user.mentor.academy.all())
+        (updated if row.id else created).append(row)
+    MentorIndex.objects.bulk_create(created)
+    MentorIndex.objects.bulk_update(updated, ['username', 'name_key', 'genres', 'academies'])
+    if existing:
+        MentorIndex.objects.filter(id__in=[row.id for row in existing.values()]).delete()
+
+
+def refresh_mentors(mentor_ids) -> None:
+    """Rebuild index rows of Mentor profiles."""
+    refresh(User.objects.filter(mentor_id__in=mentor_ids).values_list('id', flat=True))
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Rebuild the whole index. Returns the number of indexed mentors."""
+    MentorIndex.objects.exclude(user__mentor__isnull=False).delete()
+    ids = list(User.objects.filter(mentor__isnull=False).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), batch_size):
+        refresh(ids[start:start + batch_size])
+    return len(ids)
+
+
+def search(name: str = None, genre: str = None, academy: str = None, match: str = CONTAINS):
+    """Index rows matching every given term.
+
+    name and academy match anywhere in the username and in any academy
+    name, case-insensitively like icontains, so "ong" finds "hong". On
+    PostgreSQL the pg_trgm GIN indexes serve these; elsewhere they scan.
+    match=PREFIX matches them as prefixes instead, for typeahead, on the
+    name_key btree index. genre matches a whole genre name.
+    """
+    rows = MentorIndex.objects.all()
+    if name:
+        if match == PREFIX:
+            rows = rows.filter(name_key__startswith=_key(name))
+        else:
+            rows = rows.filter(name_key__contains=_key(name))
+    if genre:
+        rows = rows.filter(genres__contains=f"{SEPARATOR}{_key(genre)}{SEPARATOR}")
+    if academy:
+        # no term spans two names, as none holds the separator.
+        term = _key(academy).replace(SEPARATOR, ' ')
+        if match == PREFIX:
+            rows = rows.filter(academies__contains=f"{SEPARATOR}{term}")
+        else:
+            rows = rows.filter(academies__contains=term)
+    return rows.only('id', 'user_id', 'username')
@@ -5,6 +5,8 @@ from user.profile.models import Mentor, Mentee
 from dap.errors import FieldError
 from dap.const import DATE_FORMAT
 from dap.utils import merge_dicts
+from dap.loader import get_loader
+from user.core.genre.utils import genre_names
 
 User = get_user_model()
 
@@ -41,14 +43,15 @@ class MentorSerializer(serializers.ModelSerializer):
         return data
 
     def get_genre(self, mentor):
-        return mentor.genre.all().values_list('name', flat=True)
+        return genre_names(mentor)
 
     def get_academy(self, mentor):
-        return AcademySerializer(mentor.academy.all(), many=True).data
+        return AcademySerializer(get_loader().many(mentor, 'academy'), many=True).data
     
         
 class MenteeSerializer(serializers.ModelSerializer):
     genre = serializers.SerializerMethodField()
+    tier = serializers.CharField(source='get_tier_display', read_only=True)
 
     class Meta:
         model = Mentee
@@ -80,7 +83,7 @@ class MenteeSerializer(serializers.ModelSerializer):
         return data
 
     def get_genre(self, mentee):
-        return mentee.genre.all().values_list('name', flat=True)
+        return genre_names(mentee)
 
 class MentorUpdateSerializer(serializers.ModelSerializer):
     class Meta:
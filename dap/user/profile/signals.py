@@ -0,0 +1,92 @@
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from lesson.lesson.models import Lesson
+from lesson.lesson.signals import seats_changed
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import Mentor
+from user.profile.utils import add_courses
+from user.profile import search as mentor_index
+User = get_user_model()
+
+
+@receiver(seats_changed)
+def count_seat_courses(sender, joined, left, **kwargs):
+    """Mentees joined or left a lesson: move their courses_count and tier."""
+    add_courses(joined, 1)
+    add_courses(left, -1)
+
+
+@receiver(m2m_changed, sender=Lesson.mentee.through)
+def count_mentee_courses(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mentees set on a lesson, or lessons set on a user, directly."""
+    if action == "pre_clear":
+        instance._cleared_mentees = (
+            [instance.id] if reverse else list(instance.mentee.values_list('id', flat=True)),
+            instance.classes.count() if reverse else 1
+        )
+        return
+    if action == "post_clear":
+        user_ids, delta = getattr(instance, '_cleared_mentees', ([], 0))
+        add_courses(user_ids, -delta)
+        return
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+    sign = 1 if action == "post_add" else -1
+    if reverse:
+        add_courses([instance.id], sign * len(pk_set))
+    else:
+        add_courses(pk_set, sign)
+
+
+@receiver(pre_delete, sender=Lesson)
+def count_deleted_lesson_courses(sender, instance, **kwargs):
+    """Lesson deleted: its mentee rows cascade without m2m_changed."""
+    add_courses(list(instance.mentee.values_list('id', flat=True)), -1)
+
+
+@receiver(post_save, sender=User)
+def index_mentor(sender, instance, created, update_fields, **kwargs):
+    """Username or profile of user changed: reindex it."""
+    if update_fields and not {'username', 'mentor'} & set(update_fields):
+        return
+    if instance.mentor_id or not created:
+        mentor_index.refresh([instance.id])
+
+
+@receiver(m2m_changed, sender=Mentor.genre.through)
+@receiver(m2m_changed, sender=Mentor.academy.through)
+def index_mentor_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    """Genres or academies of mentors changed."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            mentor_index.refresh_mentors([instance.id])
+        return
+    if action == "pre_clear":
+        instance._indexed_mentors = list(instance.mentors.values_list('id', flat=True))
+    elif action == "post_clear":
+        mentor_index.refresh_mentors(getattr(instance, '_indexed_mentors', []))
+    elif action in ("post_add", "post_remove"):
+        mentor_index.refresh_mentors(pk_set or [])
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Academy)
+def index_renamed_mentors(sender, instance, created, **kwargs):
+    """Genre or academy renamed: reindex its mentors."""
+    if not created:
+        mentor_index.refresh_mentors(instance.mentors.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Academy)
+def capture_indexed_mentors(sender, instance, **kwargs):
+    instance._indexed_mentors = list(instance.mentors.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Academy)
+def index_deleted_mentors(sender, instance, **kwargs):
+    """Genre or academy deleted with its relations: reindex its mentors."""
+    mentor_index.refresh_mentors(getattr(instance, '_indexed_mentors', []))
@@ -1,6 +1,11 @@
 from dap.errors import NotAllowed
+from user.profile.models import Mentee
+from user.profile.const import TIER_THRESHOLDS, UN, RECOMPUTE_BATCH_SIZE
 from user.profile.serializers import MentorUpdateSerializer, MenteeUpdateSerializer
 from django.contrib.auth import get_user_model
+from django.db.models import F, Value, Case, When, Count, Subquery, OuterRef, IntegerField, Max
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import GreaterThanOrEqual
 User = get_user_model()
 
 def profile_update(user: User, profile: str, data: dict) -> None:
@@ -44,3 +49,51 @@ def profile_update(user: User, profile: str, data: dict) -> None:
     
     
     updated_profile.save()
+
+
+def tier_of(courses_count) -> Case:
+    """Tier of a courses_count expression, evaluated by the database."""
+    return Case(
+        *[
+            When(GreaterThanOrEqual(courses_count, threshold), then=Value(tier))
+            for threshold, tier in TIER_THRESHOLDS
+        ],
+        default=Value(UN)
+    )
+
+
+def add_courses(user_ids, delta: int) -> int:
+    """Add delta to courses_count of mentees of user_ids and retier them.
+
+    One UPDATE; tier is computed from the new count in the same statement,
+    so concurrent participations can never leave count and tier apart.
+    """
+    if not user_ids or not delta:
+        return 0
+    courses_count = Greatest(F('courses_count') + delta, Value(0))
+    return Mentee.objects.filter(user__id__in=user_ids).update(
+        courses_count=courses_count,
+        tier=tier_of(courses_count)
+    )
+
+
+def recompute_mentees(batch_size: int = RECOMPUTE_BATCH_SIZE) -> int:
+    """Recompute courses_count and tier of every mentee from participations.
+
+    Mentees are processed in id ranges of batch_size, each with one UPDATE
+    counting the lesson mentee table in a correlated aggregate.
+    Returns the number of updated mentees.
+    """
+    from lesson.lesson.models import Lesson
+
+    participations = Lesson.mentee.through.objects.filter(
+        user__mentee_id=OuterRef('id')
+    ).values('user__mentee_id').annotate(count=Count('*')).values('count')
+    courses_count = Coalesce(Subquery(participations, output_field=IntegerField()), Value(0))
+    last = Mentee.objects.aggregate(last=Max('id'))['last'] or 0
+    updated = 0
+    for start in range(1, last + 1, batch_size):
+        chunk = Mentee.objects.filter(id__gte=start, id__lt=start + batch_size)
+        updated += chunk.update(courses_count=courses_count)
+        chunk.update(tier=tier_of(F('courses_count')))
+    return updated
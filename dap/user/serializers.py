@@ -4,6 +4,8 @@ from django.contrib.auth.models import update_last_login
 from rest_framework.authtoken.models import Token
 from dap.errors import AuthentificationFailed
 from user.profile.serializers import MentorSerializer, MenteeSerializer
+from dap.loader import get_loader
+from dap.instrumentation import TimedDataMixin
 User = get_user_model()
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -62,7 +64,7 @@ class UserLoginSerializer(serializers.Serializer):
         }
 
 
-class UserRetrieveSerializer(serializers.ModelSerializer):
+class UserRetrieveSerializer(TimedDataMixin, serializers.ModelSerializer):
     mentor = serializers.SerializerMethodField()
     mentee = serializers.SerializerMethodField()
     class Meta:
@@ -85,13 +87,15 @@ class UserRetrieveSerializer(serializers.ModelSerializer):
         }
 
     def get_mentor(self, user):
-        if user.mentor:
-            return MentorSerializer(user.mentor).data
+        mentor = get_loader().one(user, 'mentor')
+        if mentor:
+            return MentorSerializer(mentor).data
         return None
 
     def get_mentee(self, user):
-        if user.mentee:
-            return MenteeSerializer(user.mentee).data
+        mentee = get_loader().one(user, 'mentee')
+        if mentee:
+            return MenteeSerializer(mentee).data
         return None
 
 class UserUpdateSerializer(serializers.ModelSerializer):
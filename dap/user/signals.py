@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+from dap.authentication import token_cache
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.autocomplete import autocomplete, ACADEMY, GENRE, MENTOR
+from user.core.genre.utils import registry as genre_registry
+User = get_user_model()
+
+
+@receiver(post_save, sender=Academy)
+def complete_academy(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.add(ACADEMY, instance.id, instance.name))
+
+
+@receiver(post_save, sender=Genre)
+def complete_genre(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete.add(GENRE, instance.id, instance.name))
+
+
+@receiver(post_save, sender=User)
+def complete_mentor(sender, instance, update_fields, **kwargs):
+    """Mentor username changed, or user became or stopped being a mentor."""
+    if update_fields and not {'username', 'mentor'} & set(update_fields):
+        return
+    if instance.mentor_id:
+        transaction.on_commit(lambda: autocomplete.add(MENTOR, instance.id, instance.username))
+    else:
+        transaction.on_commit(lambda: autocomplete.remove(MENTOR, instance.id))
+
+
+@receiver(post_delete, sender=Academy)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=User)
+def forget_completion(sender, instance, **kwargs):
+    kind = {Academy: ACADEMY, Genre: GENRE, User: MENTOR}[sender]
+    id = instance.id
+    transaction.on_commit(lambda: autocomplete.remove(kind, id))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genre_registry(sender, **kwargs):
+    transaction.on_commit(genre_registry.invalidate)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    """User changed: revoke the user's cached tokens in every process.
+
+    A new user has no cached token, and login only stamps last_login,
+    which cached users may keep stale.
+    """
+    if created:
+        return
+    token_cache.forget_user(instance.id)
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    id = instance.id
+    transaction.on_commit(lambda: token_cache.revoke(id))
+
+
+@receiver(post_delete, sender=Token)
+def forget_token(sender, instance, **kwargs):
+    """Logout: revoke the user's cached tokens in every process."""
+    token_cache.forget(instance.key)
+    user_id = instance.user_id
+    transaction.on_commit(lambda: token_cache.revoke(user_id))
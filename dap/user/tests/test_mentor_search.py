@@ -0,0 +1,43 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from user.core.academy.models import Academy
+from user.profile import search as mentor_index
+from user.profile.models import Mentor
+User = get_user_model()
+
+
+class MentorSearchTest(TestCase):
+
+    def setUp(self):
+        academy = Academy.objects.create(name="Just Jerk")
+        for i, username in enumerate(("hong", "ongsim", "kim")):
+            mentor = Mentor.objects.create(started_at=date(2020, 1, 1))
+            if username == "kim":
+                mentor.academy.set([academy])
+            User.objects.create(
+                email=f"{username}@dap.com",
+                username=username,
+                birth=date(1990, 1, 1),
+                gender="male",
+                contact=f"010{i:08d}",
+                mentor=mentor)
+        mentor_index.rebuild()
+
+    def names(self, **terms) -> list:
+        response = self.client.get('/user/mentor/', terms)
+        self.assertEqual(response.status_code, 200)
+        return sorted(username for _, username in response.data)
+
+    def test_name_matches_substring(self):
+        self.assertEqual(self.names(name="ONG"), ["hong", "ongsim"])
+
+    def test_name_matches_prefix(self):
+        self.assertEqual(self.names(name="ong", match="prefix"), ["ongsim"])
+
+    def test_academy_matches_substring(self):
+        self.assertEqual(self.names(academy="jerk"), ["kim"])
+        self.assertEqual(self.names(academy="jerk", match="prefix"), [])
+
+    def test_unknown_match(self):
+        self.assertEqual(self.client.get('/user/mentor/', {'name': "ong", 'match': "regex"}).status_code, 400)
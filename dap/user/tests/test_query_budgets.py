@@ -0,0 +1,70 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from dap.instrumentation import query_budget
+from user.core.academy.models import Academy
+from user.core.genre.models import Genre
+from user.profile.models import Mentor, Mentee
+from util.location.models import Location, LocationImage
+User = get_user_model()
+
+
+class UserQueryBudgetTest(TestCase):
+    """Every budgeted user endpoint stays within QUERY_BUDGETS."""
+
+    def setUp(self):
+        genres = [Genre.objects.create(name=name) for name in ("hiphop", "house", "popping")]
+        academies = []
+        for i in range(5):
+            location = Location.objects.create(type="academy", detail=f"a{i}", city="서울특별시", district="마포구")
+            LocationImage.objects.create(location=location, name=f"academy/{i}")
+            academies.append(Academy.objects.create(name=f"academy {i}", location=location))
+        self.mentors = []
+        for i in range(5):
+            mentor = Mentor.objects.create(started_at=date(2020, 1, 1))
+            mentor.genre.set(genres)
+            mentor.academy.set(academies)
+            self.mentors.append(User.objects.create(
+                email=f"mentor{i}@dap.com",
+                username=f"mentor{i}",
+                birth=date(1990, 1, 1),
+                gender="male",
+                contact=f"010{i:08d}",
+                mentor=mentor))
+        mentee = Mentee.objects.create(started_at=date(2021, 1, 1))
+        mentee.genre.set(genres)
+        self.mentee = User.objects.create(
+            email="mentee@dap.com",
+            username="mentee",
+            birth=date(1995, 1, 1),
+            gender="female",
+            mentee=mentee)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.mentee).key}")
+
+    def assertWithinBudget(self, tag: str, url: str, params: dict = None):
+        # the first request warms process-wide caches: token, genre names, autocomplete.
+        self.client.get(url, params)
+        with query_budget(tag):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_retrieve(self):
+        self.assertWithinBudget('user.retrieve', f'/user/{self.mentors[0].id}/')
+        self.assertWithinBudget('user.retrieve', f'/user/{self.mentee.id}/')
+
+    def test_mentor(self):
+        response = self.assertWithinBudget('user.mentor', '/user/mentor/', {'name': "men"})
+        self.assertEqual(len(response.data), len(self.mentors))
+
+    def test_academy_list(self):
+        self.assertWithinBudget('academy.list', '/academy/', {'name': "academy"})
+
+    def test_genre_list(self):
+        self.assertWithinBudget('genre.list', '/genre/', {'name': "h"})
+
+    def test_autocomplete_list(self):
+        self.assertWithinBudget('autocomplete.list', '/autocomplete/', {'q': "m"})
@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from lesson.lesson.models import Lesson
+from user.profile.const import TIER, TIER_THRESHOLDS, UN
+from user.profile.models import Mentee
+from user.profile.utils import add_courses
+User = get_user_model()
+
+
+class MenteeTierTest(TestCase):
+
+    def setUp(self):
+        self.mentee = Mentee.objects.create(started_at=date(2021, 1, 1))
+        self.user = User.objects.create(
+            email="mentee@dap.com",
+            username="mentee",
+            birth=date(1995, 1, 1),
+            gender="female",
+            mentee=self.mentee
+        )
+
+    def tier_at(self, courses_count: int) -> str:
+        Mentee.objects.filter(pk=self.mentee.pk).update(courses_count=0, tier=UN)
+        add_courses([self.user.id], courses_count)
+        self.mentee.refresh_from_db()
+        self.assertEqual(self.mentee.courses_count, courses_count)
+        return self.mentee.tier
+
+    def test_tiers_are_choice_keys(self):
+        keys = {key for key, _ in TIER}
+        max_length = Mentee._meta.get_field('tier').max_length
+        for _, tier in TIER_THRESHOLDS:
+            self.assertIn(tier, keys)
+            self.assertLessEqual(len(tier), max_length)
+
+    def test_threshold_boundaries(self):
+        lower = UN
+        for threshold, tier in reversed(TIER_THRESHOLDS):
+            self.assertEqual(self.tier_at(threshold - 1), lower)
+            self.assertEqual(self.tier_at(threshold), tier)
+            lower = tier
+
+    def test_courses_count_never_negative(self):
+        add_courses([self.user.id], 1)
+        add_courses([self.user.id], -3)
+        self.mentee.refresh_from_db()
+        self.assertEqual((self.mentee.courses_count, self.mentee.tier), (0, UN))
+
+    def test_deleted_lesson_takes_its_course_back(self):
+        started_at = timezone.now() + timedelta(days=7)
+        lesson = Lesson.objects.create(
+            title="lesson", started_at=started_at, finished_at=started_at + timedelta(hours=1), recruit_number=10)
+        lesson.mentee.add(self.user)
+        self.mentee.refresh_from_db()
+        self.assertEqual(self.mentee.courses_count, 1)
+        lesson.delete()
+        self.mentee.refresh_from_db()
+        self.assertEqual(self.mentee.courses_count, 0)
@@ -0,0 +1,34 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from dap.authentication import TokenCache, REVOKED_KEY
+from util.version.utils import get_version
+User = get_user_model()
+
+
+class TokenCacheTest(TestCase):
+
+    def setUp(self):
+        # two processes, checking for revocations on every get.
+        self.here = TokenCache(size=100, ttl=60, check_interval=0)
+        self.there = TokenCache(size=100, ttl=60, check_interval=0)
+        self.there.get('warm')
+        self.there.put('a', {'id': 1})
+        self.there.put('b', {'id': 2})
+
+    def test_revoke_drops_only_that_user_everywhere(self):
+        self.here.revoke(1)
+        self.assertIsNone(self.there.get('a'))
+        self.assertEqual(self.there.get('b'), {'id': 2})
+
+    def test_create_does_not_revoke(self):
+        version = get_version(REVOKED_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create(
+                email="user@dap.com", username="user", birth=date(1995, 1, 1), gender="female")
+        self.assertEqual(get_version(REVOKED_KEY), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Token.objects.create(user=user).delete()
+        self.assertEqual(get_version(REVOKED_KEY), version + 1)
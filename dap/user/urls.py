@@ -1,6 +1,6 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
-from user.views import UserViewSet
+from user.views import UserViewSet, AutocompleteViewSet
 from user.core.academy.views import AcademyViewSet
 from user.core.genre.views import GenreViewSet
 
@@ -11,6 +11,7 @@ router = SimpleRouter()
 router.register('user', UserViewSet, basename='user')
 router.register('academy', AcademyViewSet, basename='academy')
 router.register('genre', GenreViewSet, basename='genre')
+router.register('autocomplete', AutocompleteViewSet, basename='autocomplete')
 
 urlpatterns = [
     path('', include((router.urls))),
@@ -5,7 +5,11 @@ from user.serializers import UserCreateSerializer, UserLoginSerializer, UserRetr
 from user.profile.serializers import MentorSerializer, MenteeSerializer
 from dap.errors import FieldError, NotFound
 from user.core.genre.const import DEFAULT
-from user.profile.models import Mentor
+from user.core.genre.utils import registry as genre_registry
+from user.profile.models import MentorIndex
+from user.profile import search as mentor_index
+from dap.pagination import CursorPaginator
+from user.autocomplete import autocomplete, KINDS, LIMIT, MAX_LIMIT
 from rest_framework.decorators import action
 from user.profile.utils import profile_update
 from django.contrib.auth import get_user_model
@@ -39,7 +43,7 @@ class UserViewSet(viewsets.GenericViewSet):
                 data=mentor_data, 
                 context={
                     'academies': mentor_data.get('academies'),
-                    'genres': mentor_data.get('genres', [DEFAULT])
+                    'genres': genre_registry.resolve(mentor_data.get('genres', [DEFAULT]))
                 })
             profile_name = 'mentor'
         elif data.get('mentee'):
@@ -47,7 +51,7 @@ class UserViewSet(viewsets.GenericViewSet):
             ms = MenteeSerializer(
                 data=mentee_data,
                 context={
-                    'genres': mentee_data.get('genres', [DEFAULT])
+                    'genres': genre_registry.resolve(mentee_data.get('genres', [DEFAULT]))
                 })
             profile_name = 'mentee'
         else: 
@@ -110,28 +114,55 @@ class UserViewSet(viewsets.GenericViewSet):
 
     @action(methods=['GET'], detail=False)
     def mentor(self, request):
-        """Mentor List/Search"""
+        """Mentor List/Search
+
+        name and academy match anywhere in the name, or as prefixes with
+        ?match=prefix; genre is a whole genre name.
+        pages by ?cursor= in (username, id) order when given.
+        """
         page = request.query_params.get('page', '1')
         name = request.query_params.get('name')
         genre = request.query_params.get('genre')
         academy = request.query_params.get('academy')
-
-        mentors = User.objects.filter(mentee=None)
-        if name: 
-            mentors = mentors.filter(username__icontains=name)
-        if genre:
-            mentors = mentors.filter(mentor__genre__name=genre)
-        if academy:
-            mentors = mentors.filter(mentor__academy__name__icontains=academy)
-        if not (name or genre or academy):
-            mentors = []
-
-        results = mentors.order_by('username').values_list('id', 'username')
+        match = request.query_params.get('match', mentor_index.CONTAINS)
+        if match not in mentor_index.MATCHES:
+            raise FieldError(f"match should be one of {', '.join(mentor_index.MATCHES)}.")
+
+        if name or genre or academy:
+            mentors = mentor_index.search(name=name, genre=genre, academy=academy, match=match)
+        else:
+            mentors = MentorIndex.objects.none()
+
+        if 'cursor' in request.query_params:
+            results = CursorPaginator(mentors, 20, field='username', descending=False).get_page(
+                request.query_params['cursor'])
+            return Response({
+                'next': results.next_cursor,
+                'previous': results.previous_cursor,
+                'results': [(row.user_id, row.username) for row in results]
+            }, status=status.HTTP_200_OK)
+        results = mentors.order_by('username', 'id').values_list('user_id', 'username')
         results = Paginator(results, 20).get_page(page)
         return Response(results, status=status.HTTP_200_OK)
-            
 
-        
 
+class AutocompleteViewSet(viewsets.GenericViewSet):
+    """Typeahead API View, answered from memory."""
+    permission_classes = (permissions.AllowAny,)
 
+    def list(self, request):
+        """Academies, genres and mentors whose name starts with q.
 
+        q also matches Hangul typed halfway ("맢" for "마포") or by initials ("ㅁㅍ").
+        """
+        q = request.query_params.get('q', '')
+        kinds = request.query_params.getlist('types') or KINDS
+        if set(kinds) - set(KINDS):
+            raise FieldError(f"types should be among {', '.join(KINDS)}.")
+        try:
+            limit = int(request.query_params.get('limit', LIMIT))
+        except ValueError:
+            raise FieldError("limit should be an integer.")
+        if not 0 < limit <= MAX_LIMIT:
+            raise FieldError(f"limit should be between 1 and {MAX_LIMIT}.")
+        return Response(autocomplete.search(q, kinds, limit), status=status.HTTP_200_OK)
@@ -0,0 +1,91 @@
+"""
+Korean Address Parser
+"""
+
+import json
+import os
+from functools import lru_cache
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.json')
+
+
+class Trie:
+    """Character trie answering the longest name a text starts with."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name: str, value) -> None:
+        node = self.root
+        for char in name:
+            node = node.setdefault(char, {})
+        node[None] = value
+
+    def matches(self, text: str, start: int = 0):
+        """Yield (end, value) of every name text[start:] starts with, longest first."""
+        node, found = self.root, []
+        for index in range(start, len(text)):
+            node = node.get(text[index])
+            if node is None:
+                break
+            if None in node:
+                found.append((index + 1, node[None]))
+        return reversed(found)
+
+
+class Gazetteer:
+    """Cities and districts of the bundled gazetteer, indexed for parsing."""
+
+    def __init__(self, data: dict):
+        self.cities = Trie()
+        self.places = [(city, district) for city, entry in data.items() for district in entry['districts']]
+        self.districts = {}
+        self.all_districts = Trie()
+        owners = {}
+        for city, entry in data.items():
+            for name in [city] + entry['aliases']:
+                self.cities.add(name, city)
+            trie = self.districts[city] = Trie()
+            for district in entry['districts']:
+                trie.add(district, district)
+                owners.setdefault(district, []).append(city)
+        for district, cities in owners.items():
+            # 중구, 서구... exist in several cities and cannot tell the city alone.
+            self.all_districts.add(district, (cities[0] if len(cities) == 1 else None, district))
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    with open(GAZETTEER_PATH, encoding='utf-8') as f:
+        return Gazetteer(json.load(f))
+
+
+def _boundary(text: str, index: int) -> bool:
+    return index == len(text) or text[index].isspace() or text[index] in ',()'
+
+
+def _skip_space(text: str, index: int) -> int:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def parse(detail: str) -> tuple:
+    """(city, district) an address starts with. unknown parts are None.
+
+    ex) "서울 마포구 와우산로 94" -> ("서울특별시", "마포구")
+        "해운대구 우동 1411" -> ("부산광역시", "해운대구")
+    """
+    text = (detail or '').strip()
+    g = gazetteer()
+    for end, city in g.cities.matches(text):
+        start = _skip_space(text, end)
+        for district_end, district in g.districts[city].matches(text, start):
+            if _boundary(text, district_end):
+                return city, district
+        if _boundary(text, end):
+            return city, None
+    for end, (city, district) in g.all_districts.matches(text):
+        if _boundary(text, end):
+            return city, district
+    return None, None
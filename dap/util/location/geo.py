@@ -0,0 +1,110 @@
+"""
+Geohash and Distance Helpers
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+# Approximate (height, width) in km of a cell at each precision, at the equator.
+CELL_SIZES_KM = (
+    (5000.0, 5000.0),
+    (630.0, 1250.0),
+    (156.0, 156.0),
+    (19.5, 39.1),
+    (4.89, 4.89),
+    (0.61, 1.22),
+    (0.153, 0.153),
+    (0.019, 0.038),
+    (0.0048, 0.0048),
+)
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    """Geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit, even = 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            bounds[0] = mid
+        else:
+            bits = bits * 2
+            bounds[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[bits])
+            bits, bit = 0, 0
+    return ''.join(chars)
+
+
+def decode(geohash: str) -> tuple:
+    """(latitude, longitude, latitude error, longitude error) of a cell's center."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if bits >> shift & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+    return (
+        (lat_range[0] + lat_range[1]) / 2,
+        (lng_range[0] + lng_range[1]) / 2,
+        (lat_range[1] - lat_range[0]) / 2,
+        (lng_range[1] - lng_range[0]) / 2,
+    )
+
+
+def precision_for(radius_km: float, latitude: float = 0.0) -> int:
+    """Longest precision whose cell still covers radius_km, so 3x3 cells cover the circle.
+
+    Cells narrow towards the poles, so the width is scaled by cos(latitude).
+    """
+    cos = math.cos(math.radians(min(abs(latitude) + 1, 90)))
+    for precision in range(len(CELL_SIZES_KM), 0, -1):
+        height, width = CELL_SIZES_KM[precision - 1]
+        if min(height, width * cos) >= radius_km:
+            return precision
+    return 1
+
+
+def cover(latitude: float, longitude: float, radius_km: float) -> set:
+    """Geohash prefixes of the cell of a point and its 8 neighbours."""
+    precision = precision_for(radius_km, latitude)
+    center_lat, center_lng, lat_err, lng_err = decode(encode(latitude, longitude, precision))
+    cells = set()
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            lat = center_lat + dlat * lat_err * 2
+            if not -90 <= lat <= 90:
+                continue
+            lng = (center_lng + dlng * lng_err * 2 + 180) % 360 - 180
+            cells.add(encode(lat, lng, precision))
+    return cells
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple:
+    """(min lat, max lat, min lng, max lng) around a point."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos = max(math.cos(math.radians(latitude)), 1e-6)
+    dlng = min(math.degrees(radius_km / EARTH_RADIUS_KM / cos), 180.0)
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+
+def distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
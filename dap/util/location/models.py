@@ -9,6 +9,11 @@ class Location(models.Model):
         city (str): location's city.
         district (str): location's district.
         description (str): location's detail description.
+        key (str): content address of normalized city, district and detail.
+            locations with the same address are shared.
+        latitude (float): WGS84 latitude.
+        longitude (float): WGS84 longitude.
+        geohash (str): geohash of latitude and longitude. indexed for nearby lookup.
     """
     LOCATION_TYPE = (
         ("academy", "academy"),
@@ -21,7 +26,17 @@ class Location(models.Model):
     city = models.CharField(max_length=20, blank=True, null=True)
     district = models.CharField(max_length=20, blank=True, null=True)
     description = models.CharField(max_length=1000, blank=True, null=True)
-    
+    key = models.CharField(max_length=40, unique=True, null=True, editable=False)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'district'], name='location_city_district_idx'),
+            models.Index(fields=['geohash'], name='location_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
 
 class LocationImage(models.Model):
     """Location Image Model.
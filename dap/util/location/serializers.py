@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from dap.errors import FieldError
+from util.location.address import parse as parse_address
+from dap.loader import get_loader
 from util.location.models import LocationImage, Location
 
 class LocationImageSerializer(serializers.ModelSerializer):
@@ -21,6 +24,8 @@ class LocationSerializer(serializers.ModelSerializer):
             'city',
             'district',
             'description',
+            'latitude',
+            'longitude',
             'images'
         )
         extra_kwargs = {
@@ -28,21 +33,45 @@ class LocationSerializer(serializers.ModelSerializer):
             'type': {'required': True},
         }
 
+    def validate(self, data: dict) -> dict:
+        latitude, longitude = data.get('latitude'), data.get('longitude')
+        if (latitude is None) != (longitude is None):
+            raise FieldError("latitude and longitude should be given together.")
+        if latitude is not None:
+            if not -90 <= latitude <= 90:
+                raise FieldError("latitude should be between -90 and 90.")
+            if not -180 <= longitude <= 180:
+                raise FieldError("longitude should be between -180 and 180.")
+        if data.get('detail') and not (data.get('city') and data.get('district')):
+            city, district = parse_address(data['detail'])
+            if not data.get('city'):
+                data['city'] = city
+            if not data.get('district') and city == data['city']:
+                data['district'] = district
+        return data
+
     def create(self, validated_data: dict) -> Location:
-        # TODO: parsing detail to city, district method.
+        from util.location.utils import normalize, location_key, geohash_of
         location = Location.objects.create(
             type = validated_data['type'],
-            detail = validated_data['detail'],
-            city = validated_data.get('city'),
-            district = validated_data.get('district'),
-            description = validated_data.get('description')
+            detail = normalize(validated_data['detail']),
+            city = normalize(validated_data.get('city')) or None,
+            district = normalize(validated_data.get('district')) or None,
+            description = validated_data.get('description'),
+            latitude = validated_data.get('latitude'),
+            longitude = validated_data.get('longitude'),
+            geohash = geohash_of(validated_data),
+            key = location_key(
+                validated_data['detail'],
+                validated_data.get('city'),
+                validated_data.get('district'))
         )
         if self.context.get('images'):
             LocationImage.objects.bulk_create(
                 [
                     LocationImage(
                         location=location,
-                        name=f"{location.type}/{self.context['name']}",
+                        name=f"{location.type}/{self.context['name']}"[:50],
                         image=image
                     ) for image in self.context['images']
                 ]
@@ -50,6 +79,6 @@ class LocationSerializer(serializers.ModelSerializer):
         return location
 
     def get_images(self, location: Location):
-        if location.images:
-            return LocationImageSerializer(location.images, many=True).data
-        return None
+        if location.pk is None:
+            return None
+        return LocationImageSerializer(get_loader().many(location, 'images'), many=True).data
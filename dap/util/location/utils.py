@@ -1,8 +1,46 @@
-from util.location.models import Location
+import hashlib
+from django.db import transaction, IntegrityError
+from django.db.models import Q
+from util.location.models import Location, LocationImage
 from util.location.serializers import LocationSerializer
+from util.location import geo
+from util.location.address import parse as parse_address
+
+
+def normalize(value) -> str:
+    """Collapse whitespace of an address part."""
+    return ' '.join(str(value or '').split())
+
+
+def location_key(detail: str, city: str = None, district: str = None) -> str:
+    """Content address of a location."""
+    raw = '|'.join(normalize(value).casefold() for value in (city, district, detail))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def geohash_of(data: dict) -> str:
+    """Geohash of a location dict, None without coordinates."""
+    if data.get('latitude') is None or data.get('longitude') is None:
+        return None
+    return geo.encode(data['latitude'], data['longitude'])
+
+
+def find_location(key: str) -> Location:
+    """Location stored under key, None if new.
+
+    Looked up by the unique key index on every call. Rows are updated,
+    merged and deleted by other transactions and processes, so they are
+    not kept in memory.
+    """
+    return Location.objects.filter(key=key).first()
+
 
 def set_location(data: dict, type: str, name: str) -> Location:
-    """Set location."""
+    """Set location.
+
+    Same address is stored once and shared, with its images,
+    by every academy and lesson held there.
+    """
     location = data['location']
     location['type'] = type
     ls = LocationSerializer(
@@ -13,4 +51,177 @@ def set_location(data: dict, type: str, name: str) -> Location:
         }
     )
     ls.is_valid(raise_exception=True)
-    return ls.save()
+    key = location_key(
+        ls.validated_data['detail'],
+        ls.validated_data.get('city'),
+        ls.validated_data.get('district'))
+    existing = find_location(key)
+    if existing is not None:
+        if existing.geohash is None and geohash_of(ls.validated_data):
+            existing.latitude = ls.validated_data['latitude']
+            existing.longitude = ls.validated_data['longitude']
+            existing.geohash = geohash_of(ls.validated_data)
+            existing.save(update_fields=['latitude', 'longitude', 'geohash'])
+        return existing
+    try:
+        with transaction.atomic():
+            created = ls.save()
+    except IntegrityError:
+        return find_location(key)
+    return created
+
+
+def bulk_locations(items: list) -> list:
+    """Shared Location of every validated location dict, in order.
+
+    Existing addresses are looked up with one query and only the
+    missing ones are inserted, with one bulk_create. Addresses a concurrent
+    insert stored first are shared and not reported as created.
+    Returns [(location, created)].
+    """
+    keys = [
+        location_key(item['detail'], item.get('city'), item.get('district'))
+        for item in items
+    ]
+    found = {location.key: location for location in Location.objects.filter(key__in=set(keys))}
+    new = {}
+    for key, item in zip(keys, items):
+        if key not in found and key not in new:
+            new[key] = Location(
+                type=item['type'],
+                detail=normalize(item['detail']),
+                city=normalize(item.get('city')) or None,
+                district=normalize(item.get('district')) or None,
+                description=item.get('description'),
+                latitude=item.get('latitude'),
+                longitude=item.get('longitude'),
+                geohash=geohash_of(item),
+                key=key
+            )
+    while new:
+        try:
+            with transaction.atomic():
+                Location.objects.bulk_create(new.values())
+            break
+        except IntegrityError:
+            # a concurrent insert won some keys: share those and insert the rest.
+            won = {location.key: location for location in Location.objects.filter(key__in=new)}
+            if not won:
+                raise
+            found.update(won)
+            new = {key: location for key, location in new.items() if key not in won}
+    if new:
+        # pk is not returned by every backend.
+        for location in Location.objects.filter(key__in=new):
+            new[location.key] = location
+    found.update(new)
+    created = set(new)
+    result = []
+    for key in keys:
+        result.append((found[key], key in created))
+        created.discard(key)
+    return result
+
+
+@transaction.atomic()
+def dedupe_locations() -> int:
+    """Merge locations with the same address into the oldest one.
+
+    References and images of the duplicates are moved to the kept row.
+    Returns the number of deleted duplicates.
+    """
+    from lesson.lesson.models import Lesson
+    from lesson.series.models import LessonSeries
+    from user.core.academy.models import Academy
+
+    kept = {}
+    merge = {}
+    unkeyed = []
+    for location in Location.objects.order_by('id'):
+        key = location_key(location.detail, location.city, location.district)
+        if key in kept:
+            merge[location.id] = kept[key]
+        else:
+            kept[key] = location.id
+            if location.key != key:
+                location.key = key
+                unkeyed.append(location)
+    for duplicate, target in merge.items():
+        for model in (Lesson, LessonSeries, Academy):
+            model.objects.filter(location_id=duplicate).update(location_id=target)
+        LocationImage.objects.filter(location_id=duplicate).update(location_id=target)
+    Location.objects.filter(id__in=merge).delete()
+    # a kept row may take the key another kept row is giving up.
+    Location.objects.filter(id__in=[location.id for location in unkeyed]).update(key=None)
+    Location.objects.bulk_update(unkeyed, ['key'], batch_size=1000)
+    return len(merge)
+
+
+def near_q(latitude: float, longitude: float, radius_km: float, prefix: str = '') -> Q:
+    """Filter of locations within the bounding box of radius_km.
+
+    The geohash cells of the point and its neighbours narrow the scan
+    to an index range, and the box drops the rest of those cells.
+    """
+    cells = Q()
+    for cell in geo.cover(latitude, longitude, radius_km):
+        cells |= Q(**{f'{prefix}geohash__startswith': cell})
+    min_lat, max_lat, min_lng, max_lng = geo.bounding_box(latitude, longitude, radius_km)
+    return cells & Q(**{
+        f'{prefix}latitude__range': (min_lat, max_lat),
+        f'{prefix}longitude__range': (min_lng, max_lng),
+    })
+
+
+def backfill_addresses(batch_size: int = 1000) -> int:
+    """Fill city and district of stored locations parsed from detail.
+
+    Rows are read and written in batches of batch_size, then addresses
+    that became equal are merged by dedupe_locations. bulk_update sends no
+    signals, so the summary cells of the moved lessons are refreshed and
+    the lesson list and series city versions bumped here.
+    Returns the number of updated locations.
+    """
+    from lesson.lesson.models import Lesson
+    from lesson.lesson import cache as lesson_list_cache
+    from lesson.series.utils import invalidate_series_cities
+    from lesson.summary.utils import cells_of, refresh
+
+    queryset = Location.objects.filter(
+        Q(city__isnull=True) | Q(city='') | Q(district__isnull=True) | Q(district='')
+    ).only('id', 'detail', 'city', 'district').order_by('id')
+    updated, batch, lesson_ids, cells = 0, [], [], set()
+
+    def flush(batch):
+        ids = list(Lesson.objects.filter(
+            location_id__in=[location.id for location in batch]
+        ).values_list('id', flat=True))
+        lesson_ids.extend(ids)
+        cells.update(cells_of(ids))
+        return Location.objects.bulk_update(batch, ['city', 'district'])
+
+    for location in queryset.iterator(chunk_size=batch_size):
+        city, district = parse_address(location.detail)
+        changed = False
+        if not location.city and city:
+            location.city, changed = city, True
+        if not location.district and district and location.city == city:
+            location.district, changed = district, True
+        if not changed:
+            continue
+        batch.append(location)
+        if len(batch) == batch_size:
+            updated += flush(batch)
+            batch = []
+    if batch:
+        updated += flush(batch)
+    dedupe_locations()
+    if updated:
+        for start in range(0, len(lesson_ids), batch_size):
+            cells.update(cells_of(lesson_ids[start:start + batch_size]))
+        pending = list(cells)
+        for start in range(0, len(pending), batch_size):
+            refresh(set(pending[start:start + batch_size]))
+        lesson_list_cache.invalidate()
+        invalidate_series_cities()
+    return updated
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from util.location.utils import backfill_addresses
+
+
+class Command(BaseCommand):
+    help = "Fill missing city and district of locations parsed from their detail."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = backfill_addresses(options['batch_size'])
+        self.stdout.write(f"filled address of {count} locations.")
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from util.location.utils import dedupe_locations
+
+
+class Command(BaseCommand):
+    help = "Merge locations with the same address into one shared row."
+
+    def handle(self, *args, **options):
+        count = dedupe_locations()
+        self.stdout.write(f"merged {count} duplicate locations.")
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('util', '0002_location_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['city', 'district'], name='location_city_district_idx'),
+        ),
+    ]
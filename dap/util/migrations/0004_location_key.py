@@ -0,0 +1,38 @@
+# Generated by Django 4.0.5 on 2026-10-18 18:50
+
+import hashlib
+from django.db import migrations, models
+
+
+def fill_location_key(apps, schema_editor):
+    # Only the oldest row of an address gets its key;
+    # dedupe_locations merges the rest into it.
+    Location = apps.get_model('util', 'Location')
+    seen = set()
+    keyed = []
+    for location in Location.objects.order_by('id'):
+        raw = '|'.join(
+            ' '.join(str(value or '').split()).casefold()
+            for value in (location.city, location.district, location.detail))
+        key = hashlib.sha1(raw.encode()).hexdigest()
+        if key not in seen:
+            seen.add(key)
+            location.key = key
+            keyed.append(location)
+    Location.objects.bulk_update(keyed, ['key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('util', '0003_calendar_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='key',
+            field=models.CharField(editable=False, max_length=40, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_location_key, migrations.RunPython.noop),
+    ]
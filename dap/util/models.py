@@ -0,0 +1,2 @@
+from util.location.models import Location, LocationImage
+from util.version.models import Version
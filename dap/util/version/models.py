@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Version(models.Model):
+    """Shared Version Counter Model.
+
+    Processes embed versions in their cache keys or compare them with the
+    version they loaded, so bumping one invalidates every process at once.
+    Kept in the database rather than the cache, where it could be evicted
+    or lose a concurrent increment.
+
+    Attributes:
+        key (str): name of the versioned data. ex) "lesson-list:*"
+        value (int): current version, bumped on every change.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
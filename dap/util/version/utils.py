@@ -0,0 +1,41 @@
+from django.db import transaction, IntegrityError
+from django.db.models import F
+from util.version.models import Version
+
+
+def get_versions(keys) -> dict:
+    """key -> version of keys with one query. never bumped keys are 0."""
+    versions = dict.fromkeys(keys, 0)
+    versions.update(Version.objects.filter(key__in=versions).values_list('key', 'value'))
+    return versions
+
+
+def get_version(key: str) -> int:
+    return get_versions([key])[key]
+
+
+@transaction.atomic
+def bump(key: str) -> int:
+    """Increment key's version atomically and return it.
+
+    Call it after the change commits, so the row is not locked for the
+    rest of the writer's transaction.
+    """
+    if not Version.objects.filter(key=key).update(value=F('value') + 1):
+        try:
+            with transaction.atomic():
+                Version.objects.create(key=key, value=1)
+                return 1
+        except IntegrityError:
+            Version.objects.filter(key=key).update(value=F('value') + 1)
+    # the updated row stays locked until commit, so this is our increment.
+    return Version.objects.filter(key=key).values_list('value', flat=True).get()
+
+
+def set_version(key: str, value: int) -> None:
+    Version.objects.update_or_create(key=key, defaults={'value': value})
+
+
+def changed_since(prefix: str, value: int) -> dict:
+    """key -> version of keys starting with prefix set above value."""
+    return dict(Version.objects.filter(key__startswith=prefix, value__gt=value).values_list('key', 'value'))